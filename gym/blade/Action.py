@@ -0,0 +1,43 @@
+from enum import IntEnum
+from typing import Any, Dict, Tuple
+
+
+class ActionType(IntEnum):
+    ADD_REFERENCE_POINT = 0
+    REMOVE_REFERENCE_POINT = 1
+    LAUNCH_AIRCRAFT_FROM_SHIP = 2
+    LAUNCH_AIRCRAFT_FROM_AIRBASE = 3
+    CREATE_PATROL_MISSION = 4
+    UPDATE_PATROL_MISSION = 5
+    CREATE_STRIKE_MISSION = 6
+    UPDATE_STRIKE_MISSION = 7
+    DELETE_MISSION = 8
+    MOVE_AIRCRAFT = 9
+    MOVE_SHIP = 10
+    HANDLE_AIRCRAFT_ATTACK = 11
+    HANDLE_SHIP_ATTACK = 12
+    AIRCRAFT_RETURN_TO_BASE = 13
+    LAND_AIRCRAFT = 14
+
+
+# Game method called for each action type with the rest of the action tuple as
+# its arguments, e.g. (ActionType.MOVE_AIRCRAFT, aircraft_id, [[latitude, longitude]])
+ACTION_HANDLERS: Dict[ActionType, str] = {
+    ActionType.ADD_REFERENCE_POINT: "add_reference_point",
+    ActionType.REMOVE_REFERENCE_POINT: "remove_reference_point",
+    ActionType.LAUNCH_AIRCRAFT_FROM_SHIP: "launch_aircraft_from_ship",
+    ActionType.LAUNCH_AIRCRAFT_FROM_AIRBASE: "launch_aircraft_from_airbase",
+    ActionType.CREATE_PATROL_MISSION: "create_patrol_mission",
+    ActionType.UPDATE_PATROL_MISSION: "update_patrol_mission",
+    ActionType.CREATE_STRIKE_MISSION: "create_strike_mission",
+    ActionType.UPDATE_STRIKE_MISSION: "update_strike_mission",
+    ActionType.DELETE_MISSION: "delete_mission",
+    ActionType.MOVE_AIRCRAFT: "move_aircraft",
+    ActionType.MOVE_SHIP: "move_ship",
+    ActionType.HANDLE_AIRCRAFT_ATTACK: "handle_aircraft_attack",
+    ActionType.HANDLE_SHIP_ATTACK: "handle_ship_attack",
+    ActionType.AIRCRAFT_RETURN_TO_BASE: "aircraft_return_to_base",
+    ActionType.LAND_AIRCRAFT: "land_aicraft",
+}
+
+Action = Tuple[ActionType | int, Any]
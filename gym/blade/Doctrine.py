@@ -21,3 +21,16 @@ class SideDoctrine(TypedDict):
 
 
 Doctrine = Dict[str, SideDoctrine]
+
+# bit of each doctrine type in a side's doctrine mask (see Scenario.get_doctrine_mask)
+DOCTRINE_FLAGS: Dict[DoctrineType, int] = {
+    doctrine_type: 1 << bit for bit, doctrine_type in enumerate(DoctrineType)
+}
+
+
+def build_doctrine_mask(side_doctrine: SideDoctrine) -> int:
+    mask = 0
+    for doctrine_type, enabled in side_doctrine.items():
+        if enabled:
+            mask |= DOCTRINE_FLAGS.get(doctrine_type, 0)
+    return mask
@@ -1,29 +1,34 @@
-import json
-import copy
-from uuid import uuid4
-from typing import Tuple, Optional
+import math
+from time import perf_counter
+from typing import Callable, Tuple, Optional
+
+import numpy as np
+
 from blade.units.Aircraft import Aircraft
-from blade.units.Airbase import Airbase
-from blade.units.Facility import Facility
 from blade.units.Ship import Ship
-from blade.units.Weapon import Weapon
 from blade.units.ReferencePoint import ReferencePoint
 from blade.mission.PatrolMission import PatrolMission
 from blade.mission.StrikeMission import StrikeMission
 from blade.Scenario import Scenario
-from blade.Side import Side
-from blade.Relationships import Relationships
 from blade.Doctrine import DoctrineType
+from blade.Action import ACTION_HANDLERS
 
-from blade.utils.constants import NAUTICAL_MILES_TO_METERS
+from blade.utils.constants import (
+    KILOMETERS_TO_NAUTICAL_MILES,
+    NAUTICAL_MILES_TO_METERS,
+)
 from blade.utils.colors import SIDE_COLOR
 from blade.utils.PlaybackRecorder import PlaybackRecorder
+from blade.utils.TickProfiler import TickProfiler
 from blade.utils.utils import (
     get_bearing_between_two_points,
     get_next_coordinates,
     get_distance_between_two_points,
-    to_camelcase,
+    get_distances_between_points,
+    random_uuid,
 )
+from blade.utils.ScenarioExporter import export_scenario_bytes, export_scenario_dict
+from blade.utils.ScenarioLoader import load_scenario_file, load_scenario_string
 from blade.engine.weaponEngagement import (
     aircraft_pursuit,
     is_threat_detected,
@@ -33,6 +38,43 @@ from blade.engine.weaponEngagement import (
     weapon_engagement,
     weapon_can_engage_target,
 )
+from blade.engine.kinematics import RouteKinematics, WAYPOINT_ARRIVAL_DISTANCE_KM
+from blade.engine.engagementScheduler import EngagementScheduler
+from blade.engine.spatialIndex import SpatialGrid
+
+# counted per tick in Game.tick_events: hostile aircraft that came into the range
+# of a unit checking for threats, weapons that reached their target, and targets
+# those weapons killed
+TICK_EVENTS = ("detections", "weapon_impacts", "units_destroyed")
+# the Game methods update_game_state runs each tick, in order, with the scenario
+# unit lists whose size a TickProfiler records as the units the phase processed.
+# The time step is chosen between the engagement and the movement phases, once
+# launches and mission routes are known
+ENGAGEMENT_PHASES = (
+    ("facility_auto_defense", ("facilities",)),
+    ("ship_auto_defense", ("ships",)),
+    ("aircraft_air_to_air_engagement", ("aircraft",)),
+    ("update_units_on_patrol_mission", ("missions",)),
+    ("clear_completed_strike_missions", ("missions",)),
+    ("update_units_on_strike_mission", ("missions",)),
+    ("update_weapon_engagements", ("weapons",)),
+)
+MOVEMENT_PHASES = (
+    ("update_all_aircraft_position", ("aircraft",)),
+    ("update_all_ship_position", ("ships",)),
+    ("update_onboard_weapon_positions", ("aircraft", "facilities", "ships")),
+)
+TICK_PHASES = ENGAGEMENT_PHASES + MOVEMENT_PHASES
+# share of the time a hostile aircraft needs to come into a detector's range or
+# weapon range that one adaptive time step may take, the rest covers turns, speed
+# changes and units nearer the poles
+TIME_STEP_MARGIN = 0.5
+# lower bound on the cosine of latitude when bounding how fast a unit's longitude
+# changes
+MIN_LATITUDE_COSINE = 0.01
+# the fuel an aircraft needs to return to base grows at most at its fuel rate, so
+# its margin over 1.1 times that need shrinks at most at 2.1 times the fuel rate
+RTB_MARGIN_BURN_FACTOR = 2.1
 
 
 class Game:
@@ -42,13 +84,26 @@ class Game:
         current_scenario: Scenario,
         record_every_seconds: Optional[int] = None,
         recording_export_path: Optional[str] = ".",
+        vectorized_kinematics: bool = False,
+        recording_format: str = "jsonl",
+        recorder: Optional[PlaybackRecorder] = None,
+        profiler: Optional[TickProfiler] = None,
+        max_time_step: int = 1,
+        seed: Optional[int | np.random.SeedSequence] = None,
     ):
         self.current_scenario = current_scenario
-        self.initial_scenario = current_scenario
+        self.initial_scenario_snapshot = current_scenario.snapshot()
+        self._initial_scenario = None
 
         self.current_side_id = ""
         self.recording_scenario = False
-        self.recorder = PlaybackRecorder(record_every_seconds, recording_export_path)
+        self.recorder = (
+            recorder
+            if recorder is not None
+            else PlaybackRecorder(
+                record_every_seconds, recording_export_path, recording_format
+            )
+        )
         self.scenario_paused = True
         self.current_attacker_id = ""
         self.map_view = {
@@ -57,11 +112,38 @@ class Game:
             "defaultZoom": 0,
             "currentCameraZoom": 0,
         }
+        self.aircraft_kinematics = RouteKinematics() if vectorized_kinematics else None
+        self.ship_kinematics = RouteKinematics() if vectorized_kinematics else None
+        self.aircraft_index = SpatialGrid()
+        self.engagement_scheduler = EngagementScheduler()
+        self.max_time_step = max_time_step
+        # seconds the last update moved the units, chosen by get_time_step
+        self.time_step = 1
+        # without a seed the game draws from the random module, seeded with
+        # random.seed, as it always has
+        self.rng: Optional[np.random.Generator] = (
+            np.random.default_rng(seed) if seed is not None else None
+        )
+        self.tick_events = dict.fromkeys(TICK_EVENTS, 0)
+        self.profiler = profiler
+        self.action_handlers = {
+            action_type: getattr(self, handler_name)
+            for action_type, handler_name in ACTION_HANDLERS.items()
+        }
+
+    @property
+    def initial_scenario(self) -> Scenario:
+        if self._initial_scenario is None:
+            self._initial_scenario = Scenario.restore(self.initial_scenario_snapshot)
+        return self._initial_scenario
+
+    @initial_scenario.setter
+    def initial_scenario(self, scenario: Scenario) -> None:
+        self.initial_scenario_snapshot = scenario.snapshot()
+        self._initial_scenario = None
 
     def remove_aircraft(self, aircraft_id: str) -> None:
-        self.current_scenario.aircraft.remove(
-            self.current_scenario.get_aircraft(aircraft_id)
-        )
+        self.current_scenario.aircraft.remove_by_id(aircraft_id)
 
     def land_aicraft(self, aircraft_id: str) -> None:
         aircraft = self.current_scenario.get_aircraft(aircraft_id)
@@ -98,7 +180,7 @@ class Game:
             return None
 
         reference_point = ReferencePoint(
-            id=str(uuid4()),
+            id=random_uuid(self.rng),
             name=reference_point_name,
             side_id=self.current_side_id,
             latitude=latitude,
@@ -110,9 +192,7 @@ class Game:
         return reference_point
 
     def remove_reference_point(self, reference_point_id: str) -> None:
-        self.current_scenario.reference_points.remove(
-            self.current_scenario.get_reference_point(reference_point_id)
-        )
+        self.current_scenario.reference_points.remove_by_id(reference_point_id)
 
     def launch_aircraft_from_ship(self, ship_id: str) -> Aircraft | None:
         if not self.current_side_id:
@@ -146,7 +226,7 @@ class Game:
             return
         current_side_id = self.current_scenario.get_side(self.current_side_id).id
         mission = PatrolMission(
-            id=str(uuid4()),
+            id=random_uuid(self.rng),
             name=mission_name,
             side_id=current_side_id if current_side_id else self.current_side_id,
             assigned_unit_ids=assigned_units,
@@ -180,7 +260,7 @@ class Game:
     ) -> None:
         current_side_id = self.current_scenario.get_side(self.current_side_id).id
         strike_mission = StrikeMission(
-            id=str(uuid4()),
+            id=random_uuid(self.rng),
             name=mission_name,
             side_id=current_side_id if current_side_id else self.current_side_id,
             assigned_unit_ids=assigned_attackers,
@@ -316,21 +396,89 @@ class Game:
 
         return 0
 
+    def get_fuel_needed_to_return_to_base_vectorized(
+        self, aircraft_list: list[Aircraft], candidates: np.ndarray
+    ) -> np.ndarray:
+        """
+        get_fuel_needed_to_return_to_base for the aircraft just advanced by
+        aircraft_kinematics, computed only where candidates is set. The closest
+        base search is one distance matrix per side instead of a loop per aircraft.
+        """
+        kinematics = self.aircraft_kinematics
+        count = len(aircraft_list)
+        latitude = kinematics.latitude[:count]
+        longitude = kinematics.longitude[:count]
+        speed = kinematics.speed[:count]
+        base_latitude = np.full(count, np.nan)
+        base_longitude = np.full(count, np.nan)
+        closest_base_searches = {}
+        for index in np.flatnonzero(candidates & (speed != 0)).tolist():
+            aircraft = aircraft_list[index]
+            if aircraft.home_base_id != "":
+                home_base = self.current_scenario.get_aircraft_homebase(aircraft.id)
+                if home_base:
+                    base_latitude[index] = home_base.latitude
+                    base_longitude[index] = home_base.longitude
+            else:
+                closest_base_searches.setdefault(aircraft.side_id, []).append(index)
+
+        for side_id, indices in closest_base_searches.items():
+            bases = [
+                base
+                for base in self.current_scenario.airbases + self.current_scenario.ships
+                if base.side_id == side_id
+            ]
+            if len(bases) == 0:
+                continue
+            side_base_latitude = np.array([base.latitude for base in bases])
+            side_base_longitude = np.array([base.longitude for base in bases])
+            closest = get_distances_between_points(
+                latitude[indices, np.newaxis],
+                longitude[indices, np.newaxis],
+                side_base_latitude,
+                side_base_longitude,
+            ).argmin(axis=1)
+            base_latitude[indices] = side_base_latitude[closest]
+            base_longitude[indices] = side_base_longitude[closest]
+
+        fuel_needed = np.zeros(count)
+        has_base = ~np.isnan(base_latitude)
+        distance_to_base_nm = (
+            get_distances_between_points(
+                latitude[has_base],
+                longitude[has_base],
+                base_latitude[has_base],
+                base_longitude[has_base],
+            )
+            * 1000
+        ) / NAUTICAL_MILES_TO_METERS
+        fuel_rate = kinematics.fuel_rate[:count]
+        fuel_needed[has_base] = (
+            distance_to_base_nm / speed[has_base] * fuel_rate[has_base]
+        )
+        return fuel_needed
+
     def facility_auto_defense(self) -> None:
+        self.aircraft_index.build(self.current_scenario.aircraft)
+        self.engagement_scheduler.refresh(self.current_scenario)
         for facility in self.current_scenario.facilities:
+            hostile_side_ids = self.current_scenario.relationships.get_hostile_side_ids(
+                facility.side_id
+            )
             if self.current_scenario.check_side_doctrine(
                 facility.side_id, DoctrineType.SAM_ATTACK_HOSTILE
             ):
-                for aircraft in self.current_scenario.aircraft:
-                    if self.current_scenario.is_hostile(facility.side_id, aircraft.side_id):
+                for aircraft in self.engagement_scheduler.get_detected_threats(
+                    self.aircraft_index, facility, hostile_side_ids
+                ):
+                    if aircraft.side_id in hostile_side_ids:
                         facility_weapon = (
                             facility.get_weapon_with_highest_engagement_range()
                         )
                         if facility_weapon is None:
                             continue
                         if (
-                            is_threat_detected(aircraft, facility)
-                            and weapon_can_engage_target(aircraft, facility_weapon)
+                            weapon_can_engage_target(aircraft, facility_weapon)
                             and check_target_tracked_by_count(
                                 self.current_scenario, aircraft
                             )
@@ -343,8 +491,8 @@ class Game:
                                 facility_weapon,
                                 1,
                             )
-            for weapon in self.current_scenario.weapons:
-                if self.current_scenario.is_hostile(facility.side_id, weapon.side_id):
+            for weapon in self.current_scenario.weapons.get_targeting(facility.id):
+                if weapon.side_id in hostile_side_ids:
                     facility_weapon = (
                         facility.get_weapon_with_highest_engagement_range()
                     )
@@ -366,18 +514,24 @@ class Game:
                         )
 
     def ship_auto_defense(self) -> None:
+        self.aircraft_index.build(self.current_scenario.aircraft)
+        self.engagement_scheduler.refresh(self.current_scenario)
         for ship in self.current_scenario.ships:
+            hostile_side_ids = self.current_scenario.relationships.get_hostile_side_ids(
+                ship.side_id
+            )
             if self.current_scenario.check_side_doctrine(
                 ship.side_id, DoctrineType.SHIP_ATTACK_HOSTILE
             ):
-                for aircraft in self.current_scenario.aircraft:
-                    if self.current_scenario.is_hostile(ship.side_id, aircraft.side_id):
+                for aircraft in self.engagement_scheduler.get_detected_threats(
+                    self.aircraft_index, ship, hostile_side_ids
+                ):
+                    if aircraft.side_id in hostile_side_ids:
                         ship_weapon = ship.get_weapon_with_highest_engagement_range()
                         if ship_weapon is None:
                             continue
                         if (
-                            is_threat_detected(aircraft, ship)
-                            and weapon_can_engage_target(aircraft, ship_weapon)
+                            weapon_can_engage_target(aircraft, ship_weapon)
                             and check_target_tracked_by_count(
                                 self.current_scenario, aircraft
                             )
@@ -390,8 +544,8 @@ class Game:
                                 ship_weapon,
                                 1,
                             )
-            for weapon in self.current_scenario.weapons:
-                if self.current_scenario.is_hostile(ship.side_id, weapon.side_id):
+            for weapon in self.current_scenario.weapons.get_targeting(ship.id):
+                if weapon.side_id in hostile_side_ids:
                     ship_weapon = ship.get_weapon_with_highest_engagement_range()
                     if ship_weapon is None:
                         continue
@@ -411,6 +565,8 @@ class Game:
                         )
 
     def aircraft_air_to_air_engagement(self) -> None:
+        self.aircraft_index.build(self.current_scenario.aircraft)
+        self.engagement_scheduler.refresh(self.current_scenario)
         for aircraft in self.current_scenario.aircraft:
             if len(aircraft.weapons) == 0:
                 continue
@@ -419,18 +575,23 @@ class Game:
             )
             if aircraft_weapon_with_max_range is None:
                 continue
+            hostile_side_ids = self.current_scenario.relationships.get_hostile_side_ids(
+                aircraft.side_id
+            )
             if self.current_scenario.check_side_doctrine(
                 aircraft.side_id, DoctrineType.AIRCRAFT_ATTACK_HOSTILE
             ):
-                for enemy_aircraft in self.current_scenario.aircraft:
-                    if self.current_scenario.is_hostile(
-                        aircraft.side_id, enemy_aircraft.side_id
-                    ) and (
-                        aircraft.target_id == "" or aircraft.target_id == enemy_aircraft.id
+                for enemy_aircraft in self.engagement_scheduler.get_detected_threats(
+                    self.aircraft_index, aircraft, hostile_side_ids
+                ):
+                    if enemy_aircraft.side_id not in hostile_side_ids:
+                        continue
+                    if (
+                        aircraft.target_id == ""
+                        or aircraft.target_id == enemy_aircraft.id
                     ):
                         if (
-                            is_threat_detected(enemy_aircraft, aircraft)
-                            and weapon_can_engage_target(
+                            weapon_can_engage_target(
                                 enemy_aircraft, aircraft_weapon_with_max_range
                             )
                             and check_target_tracked_by_count(
@@ -446,10 +607,10 @@ class Game:
                                 1,
                             )
                             aircraft.target_id = enemy_aircraft.id
-            for enemy_weapon in self.current_scenario.weapons:
-                if self.current_scenario.is_hostile(
-                    aircraft.side_id, enemy_weapon.side_id
-                ):
+            for enemy_weapon in self.current_scenario.weapons.get_targeting(
+                aircraft.id
+            ):
+                if enemy_weapon.side_id in hostile_side_ids:
                     if (
                         enemy_weapon.target_id == aircraft.id
                         and is_threat_detected(enemy_weapon, aircraft)
@@ -492,7 +653,7 @@ class Game:
                     continue
                 if len(unit.route) == 0:
                     random_waypoint_in_patrol_area = (
-                        mission.generate_random_coordinates_within_patrol_area()
+                        mission.generate_random_coordinates_within_patrol_area(self.rng)
                     )
                     unit.route.append(random_waypoint_in_patrol_area)
                 elif len(unit.route) > 0:
@@ -501,7 +662,9 @@ class Game:
                     ):
                         unit.route = []
                         random_waypoint_in_patrol_area = (
-                            mission.generate_random_coordinates_within_patrol_area()
+                            mission.generate_random_coordinates_within_patrol_area(
+                                self.rng
+                            )
                         )
                         unit.route.append(random_waypoint_in_patrol_area)
 
@@ -642,7 +805,11 @@ class Game:
                     attacker.target_id = target.id
 
     def update_all_aircraft_position(self) -> None:
-        for aircraft in self.current_scenario.aircraft:
+        if self.aircraft_kinematics is not None:
+            self.update_all_aircraft_position_vectorized()
+            return
+        self.current_scenario.aircraft.defer_removals()
+        for aircraft in self.current_scenario.aircraft.iter_remaining():
             if aircraft.rtb:
                 aircraft_homebase = (
                     self.current_scenario.get_aircraft_homebase(aircraft.id)
@@ -686,6 +853,7 @@ class Game:
                         next_waypoint_latitude,
                         next_waypoint_longitude,
                         aircraft.speed,
+                        self.time_step,
                     )
                     next_aircraft_latitude = next_aircraft_coordinates[0]
                     next_aircraft_longitude = next_aircraft_coordinates[1]
@@ -697,7 +865,7 @@ class Game:
                         next_waypoint_latitude,
                         next_waypoint_longitude,
                     )
-            aircraft.current_fuel -= aircraft.fuel_rate / 3600
+            aircraft.current_fuel -= aircraft.fuel_rate / 3600 * self.time_step
             fuel_needed_to_return_to_base = self.get_fuel_needed_to_return_to_base(
                 aircraft
             )
@@ -711,9 +879,63 @@ class Game:
                 and not aircraft.rtb
             ):
                 self.aircraft_return_to_base(aircraft.id)
+        self.current_scenario.aircraft.apply_removals()
+
+    def update_all_aircraft_position_vectorized(self) -> None:
+        airborne_aircraft = []
+        self.current_scenario.aircraft.defer_removals()
+        for aircraft in self.current_scenario.aircraft.iter_remaining():
+            if aircraft.rtb:
+                aircraft_homebase = (
+                    self.current_scenario.get_aircraft_homebase(aircraft.id)
+                    if aircraft.home_base_id != ""
+                    else self.current_scenario.get_closest_base_to_aircraft(aircraft.id)
+                )
+                if (
+                    aircraft_homebase is not None
+                    and get_distance_between_two_points(
+                        aircraft.latitude,
+                        aircraft.longitude,
+                        aircraft_homebase.latitude,
+                        aircraft_homebase.longitude,
+                    )
+                    < 0.5
+                ):
+                    self.land_aicraft(aircraft.id)
+                    continue
+            airborne_aircraft.append(aircraft)
+
+        self.aircraft_kinematics.advance(airborne_aircraft, self.time_step)
+
+        current_fuel = self.aircraft_kinematics.current_fuel[: len(airborne_aircraft)]
+        rtb_candidates = np.array(
+            [
+                not aircraft.rtb
+                and self.current_scenario.check_side_doctrine(
+                    aircraft.side_id, DoctrineType.AIRCRAFT_RTB_WHEN_OUT_OF_RANGE
+                )
+                for aircraft in airborne_aircraft
+            ],
+            dtype=bool,
+        ) & (current_fuel > 0)
+        fuel_needed = self.get_fuel_needed_to_return_to_base_vectorized(
+            airborne_aircraft, rtb_candidates
+        )
+        return_to_base = rtb_candidates & (current_fuel < fuel_needed * 1.1)
+
+        for index, aircraft in enumerate(airborne_aircraft):
+            if aircraft.current_fuel <= 0:
+                self.remove_aircraft(aircraft.id)
+            elif return_to_base[index]:
+                self.aircraft_return_to_base(aircraft.id)
+        self.current_scenario.aircraft.apply_removals()
 
     def update_all_ship_position(self) -> None:
-        for ship in self.current_scenario.ships:
+        if self.ship_kinematics is not None:
+            self.update_all_ship_position_vectorized()
+            return
+        self.current_scenario.ships.defer_removals()
+        for ship in self.current_scenario.ships.iter_remaining():
             route = ship.route
             if len(route) < 1:
                 continue
@@ -739,6 +961,7 @@ class Game:
                     next_waypoint_latitude,
                     next_waypoint_longitude,
                     ship.speed,
+                    self.time_step,
                 )
                 next_ship_latitude = next_ship_coordinates[0]
                 next_ship_longitude = next_ship_coordinates[1]
@@ -750,9 +973,21 @@ class Game:
                     next_waypoint_latitude,
                     next_waypoint_longitude,
                 )
-            ship.current_fuel -= ship.fuel_rate / 3600
+            ship.current_fuel -= ship.fuel_rate / 3600 * self.time_step
+            if ship.current_fuel <= 0:
+                self.current_scenario.ships.remove(ship)
+        self.current_scenario.ships.apply_removals()
+
+    def update_all_ship_position_vectorized(self) -> None:
+        routed_ships = [
+            ship for ship in self.current_scenario.ships if len(ship.route) > 0
+        ]
+        self.ship_kinematics.advance(routed_ships, self.time_step)
+        self.current_scenario.ships.defer_removals()
+        for ship in routed_ships:
             if ship.current_fuel <= 0:
                 self.current_scenario.ships.remove(ship)
+        self.current_scenario.ships.apply_removals()
 
     def update_onboard_weapon_positions(self) -> None:
         for aircraft in self.current_scenario.aircraft:
@@ -768,33 +1003,225 @@ class Game:
                 weapon.latitude = ship.latitude
                 weapon.longitude = ship.longitude
 
-    def update_game_state(self) -> None:
-        self.current_scenario.current_time += 1
-
-        self.facility_auto_defense()
-        self.ship_auto_defense()
-        self.aircraft_air_to_air_engagement()
-
-        self.update_units_on_patrol_mission()
-        self.clear_completed_strike_missions()
-        self.update_units_on_strike_mission()
-
-        for weapon in self.current_scenario.weapons:
-            weapon_engagement(self.current_scenario, weapon)
+    def update_weapon_engagements(self) -> None:
+        # units destroyed by a weapon stay in their lists, skipped, until the
+        # phase ends and each list is compacted once
+        self.current_scenario.defer_removals()
+        for weapon in self.current_scenario.weapons.iter_remaining():
+            target_destroyed = weapon_engagement(
+                self.current_scenario, weapon, self.rng
+            )
+            if target_destroyed is not None:
+                self.tick_events["weapon_impacts"] += 1
+                if target_destroyed:
+                    self.tick_events["units_destroyed"] += 1
+        self.current_scenario.apply_removals()
+
+    def get_seconds_to_next_waypoint(self, unit: Aircraft | Ship) -> float:
+        route = unit.route
+        if len(route) == 0 or unit.speed == 0:
+            return math.inf
+        distance_km = get_distance_between_two_points(
+            unit.latitude, unit.longitude, route[0][0], route[0][1]
+        )
+        if distance_km < WAYPOINT_ARRIVAL_DISTANCE_KM:
+            return 0
+        return distance_km * KILOMETERS_TO_NAUTICAL_MILES / abs(unit.speed) * 3600
 
-        self.update_all_aircraft_position()
-        self.update_all_ship_position()
-        self.update_onboard_weapon_positions()
+    def get_degrees_per_second(self, unit: Aircraft | Ship) -> float:
+        """Bounds how fast the unit moves on the latitude/longitude plane."""
+        latitude_cosine = max(
+            math.cos(math.radians(unit.latitude)), MIN_LATITUDE_COSINE
+        )
+        return abs(unit.speed) / 60 / 3600 / latitude_cosine
+
+    def get_time_step(self) -> int:
+        """
+        The longest step, up to max_time_step seconds, in which no unit reaches a
+        waypoint, runs out of fuel or drops below the fuel it needs to return to
+        base, and no hostile aircraft can come into a detector's range or into the
+        range of the weapons of a detector that already sees it. One second while
+        weapons are in flight.
+        """
+        if self.max_time_step <= 1:
+            return 1
+        current_scenario = self.current_scenario
+        if len(current_scenario.weapons) > 0:
+            return 1
+
+        seconds = float(self.max_time_step)
+        for detector, hostile_side_ids, threats in self.engagement_scheduler.encounters:
+            detector_weapon = detector.get_weapon_with_highest_engagement_range()
+            if detector_weapon is None:
+                continue
+            engagement_range_nm = detector_weapon.get_engagement_range()
+            detector_speed = abs(getattr(detector, "speed", 0))
+            for threat in threats:
+                if threat.side_id not in hostile_side_ids:
+                    continue
+                distance_nm = (
+                    get_distance_between_two_points(
+                        detector.latitude,
+                        detector.longitude,
+                        threat.latitude,
+                        threat.longitude,
+                    )
+                    * KILOMETERS_TO_NAUTICAL_MILES
+                )
+                closing_speed = detector_speed + abs(threat.speed)
+                if distance_nm <= engagement_range_nm:
+                    return 1
+                if closing_speed > 0:
+                    seconds = min(
+                        seconds,
+                        (distance_nm - engagement_range_nm)
+                        / closing_speed
+                        * 3600
+                        * TIME_STEP_MARGIN,
+                    )
+            if seconds < 2:
+                return 1
+
+        # fastest change of a unit's position in degrees per second
+        fastest_degrees = 0.0
+        for aircraft in current_scenario.aircraft:
+            if aircraft.fuel_rate > 0:
+                seconds = min(
+                    seconds, aircraft.current_fuel / aircraft.fuel_rate * 3600
+                )
+                if not aircraft.rtb and current_scenario.check_side_doctrine(
+                    aircraft.side_id, DoctrineType.AIRCRAFT_RTB_WHEN_OUT_OF_RANGE
+                ):
+                    fuel_margin = (
+                        aircraft.current_fuel
+                        - self.get_fuel_needed_to_return_to_base(aircraft) * 1.1
+                    )
+                    seconds = min(
+                        seconds,
+                        fuel_margin
+                        / (aircraft.fuel_rate * RTB_MARGIN_BURN_FACTOR)
+                        * 3600,
+                    )
+            if len(aircraft.route) > 0:
+                seconds = min(seconds, self.get_seconds_to_next_waypoint(aircraft))
+                fastest_degrees = max(
+                    fastest_degrees, self.get_degrees_per_second(aircraft)
+                )
+            if seconds < 2:
+                return 1
+        for ship in current_scenario.ships:
+            if len(ship.route) == 0:
+                continue
+            if ship.fuel_rate > 0:
+                seconds = min(seconds, ship.current_fuel / ship.fuel_rate * 3600)
+            seconds = min(seconds, self.get_seconds_to_next_waypoint(ship))
+            fastest_degrees = max(fastest_degrees, self.get_degrees_per_second(ship))
+            if seconds < 2:
+                return 1
+
+        if fastest_degrees > 0:
+            # a detector and a threat close at most at twice the fastest unit
+            seconds = min(
+                seconds,
+                self.engagement_scheduler.get_wake_gap()
+                * TIME_STEP_MARGIN
+                / (2 * fastest_degrees),
+            )
+        return max(1, int(seconds))
 
-    def handle_action(self, action: list | str) -> None:
-        if not action or action == "" or len(action) == 0:
+    def update_game_state(self) -> None:
+        tick_events = self.tick_events
+        for event in TICK_EVENTS:
+            tick_events[event] = 0
+
+        if self.profiler is not None:
+            self.profiler.start_tick(self.current_scenario.current_time)
+        self.run_phases(ENGAGEMENT_PHASES)
+        self.time_step = self.get_time_step()
+        self.run_phases(MOVEMENT_PHASES)
+        # every phase saw the time the tick started at
+        self.current_scenario.current_time += self.time_step
+        tick_events["detections"] = self.engagement_scheduler.new_contacts
+
+    def run_phases(self, phases: Tuple[Tuple[str, Tuple[str, ...]], ...]) -> None:
+        profiler = self.profiler
+        if profiler is None:
+            for phase, _ in phases:
+                getattr(self, phase)()
+            return
+        for phase, unit_lists in phases:
+            units = 0
+            for unit_list in unit_lists:
+                units += len(getattr(self.current_scenario, unit_list))
+            start = perf_counter()
+            getattr(self, phase)()
+            profiler.record(phase, perf_counter() - start, units)
+
+    def advance(
+        self,
+        ticks: int,
+        until: Callable[[dict], bool] | str | None = None,
+        record: bool = False,
+    ) -> dict:
+        """
+        Runs up to ticks updates without building observations, stopping after the
+        first tick where until(tick_events) is true or, if until names one of
+        TICK_EVENTS, where that event happened. Returns the summed event counts.
+        """
+        if isinstance(until, str):
+            if until not in TICK_EVENTS:
+                raise ValueError(
+                    f"Unknown event: {until}, expected one of {TICK_EVENTS}"
+                )
+            event_name = until
+            until = lambda tick_events: tick_events[event_name] > 0
+
+        summary = dict.fromkeys(TICK_EVENTS, 0)
+        ticks_advanced = 0
+        stopped = False
+        game_ended = False
+        while ticks_advanced < ticks:
+            self.update_game_state()
+            ticks_advanced += 1
+            if record:
+                self.record_step()
+            for event, count in self.tick_events.items():
+                summary[event] += count
+            if self.check_game_ended():
+                game_ended = True
+                break
+            if until is not None and until(self.tick_events):
+                stopped = True
+                break
+
+        summary["ticks"] = ticks_advanced
+        summary["current_time"] = self.current_scenario.current_time
+        summary["stopped"] = stopped
+        summary["game_ended"] = game_ended
+        return summary
+
+    def handle_structured_action(self, action: tuple) -> None:
+        handler = self.action_handlers.get(action[0])
+        if handler is None:
+            raise ValueError(f"Unknown action type: {action[0]}")
+        handler(*action[1:])
+
+    def handle_action(self, action: list | tuple | str) -> None:
+        if action is None or len(action) == 0:
             return
         try:
-            if isinstance(action, str):
+            if isinstance(action, tuple):
+                self.handle_structured_action(action)
+            elif isinstance(action, str):
                 exec(f"{"self." if "self." not in action else ""}{action}")
             elif isinstance(action, list):
                 for sub_action in action:
-                    exec(f"{"self." if "self." not in sub_action else ""}{sub_action}")
+                    if isinstance(sub_action, tuple):
+                        self.handle_structured_action(sub_action)
+                    else:
+                        exec(
+                            f"{"self." if "self." not in sub_action else ""}{sub_action}"
+                        )
         except Exception as e:
             print(e)
 
@@ -814,22 +1241,26 @@ class Game:
         info = self._get_info()
         return observation, reward, terminated, truncated, info
 
-    def reset(self):
-        self.current_scenario = copy.deepcopy(self.initial_scenario)
+    def reset(self, seed: Optional[int | np.random.SeedSequence] = None):
+        """
+        Restores the initial scenario. A seed restarts the game's random number
+        generator, so runs reset with the same seed play out the same.
+        """
+        if seed is not None:
+            self.rng = np.random.default_rng(seed)
+        self.current_scenario = Scenario.restore(self.initial_scenario_snapshot)
         assert len(self.current_scenario.sides) > 0
         self.current_side_id = self.current_scenario.sides[0].id
         self.scenario_paused = True
         self.current_attacker_id = ""
+        self.time_step = 1
 
     def check_game_ended(self) -> bool:
         return False
 
     def export_scenario(self) -> dict:
-        scenario_json_string = self.current_scenario.toJson()
-        scenario_json_no_underscores = to_camelcase(scenario_json_string)
-
         export_object = {
-            "currentScenario": json.loads(scenario_json_no_underscores),
+            "currentScenario": export_scenario_dict(self.current_scenario),
             "currentSideId": self.current_side_id,
             "selectedUnitId": "",
             "mapView": self.map_view,
@@ -838,391 +1269,29 @@ class Game:
         return export_object
 
     def load_scenario(self, scenario_string: str) -> None:
-        import_object = json.loads(scenario_string)
-        self.current_side_id = import_object["currentSideId"]
-        self.map_view = import_object["mapView"]
+        import_object, loaded_scenario = load_scenario_string(scenario_string)
+        self._set_loaded_scenario(import_object, loaded_scenario)
 
-        saved_scenario = import_object["currentScenario"]
-        saved_sides = []
-        for side in saved_scenario["sides"]:
-            saved_sides.append(
-                Side(
-                    id=side["id"],
-                    name=side["name"],
-                    total_score=side["totalScore"],
-                    color=side["color"],
-                )
-            )
-        loaded_scenario = Scenario(
-            id=saved_scenario["id"],
-            name=saved_scenario["name"],
-            start_time=saved_scenario["startTime"],
-            current_time=saved_scenario["currentTime"],
-            duration=saved_scenario["duration"],
-            sides=saved_sides,
-            time_compression=saved_scenario["timeCompression"],
-            relationships=Relationships(
-                hostiles=(
-                    saved_scenario["relationships"]["hostiles"]
-                    if "relationships" in saved_scenario.keys()
-                    and saved_scenario["relationships"]["hostiles"]
-                    else {}
-                ),
-                allies=(
-                    saved_scenario["relationships"]["allies"]
-                    if "relationships" in saved_scenario.keys()
-                    and saved_scenario["relationships"]["allies"]
-                    else {}
-                ),
-            ),
-            doctrine=saved_scenario["doctrine"]
-        )
-        for aircraft in saved_scenario["aircraft"]:
-            aircraft_weapons = []
-            if aircraft["weapons"]:
-                for weapon in aircraft["weapons"]:
-                    aircraft_weapons.append(
-                        Weapon(
-                            id=weapon["id"],
-                            name=weapon["name"],
-                            side_id=weapon["sideId"],
-                            class_name=weapon["className"],
-                            latitude=weapon["latitude"],
-                            longitude=weapon["longitude"],
-                            altitude=weapon["altitude"],
-                            heading=weapon["heading"],
-                            speed=weapon["speed"],
-                            current_fuel=weapon["currentFuel"],
-                            max_fuel=weapon["maxFuel"],
-                            fuel_rate=weapon["fuelRate"],
-                            range=weapon["range"],
-                            route=weapon["route"],
-                            side_color=weapon["sideColor"],
-                            target_id=weapon["targetId"],
-                            lethality=weapon["lethality"],
-                            max_quantity=weapon["maxQuantity"],
-                            current_quantity=weapon["currentQuantity"],
-                        )
-                    )
-            loaded_scenario.aircraft.append(
-                Aircraft(
-                    id=aircraft["id"],
-                    name=aircraft["name"],
-                    side_id=aircraft["sideId"],
-                    class_name=aircraft["className"],
-                    latitude=aircraft["latitude"],
-                    longitude=aircraft["longitude"],
-                    altitude=aircraft["altitude"],
-                    heading=aircraft["heading"],
-                    speed=aircraft["speed"],
-                    current_fuel=aircraft["currentFuel"],
-                    max_fuel=aircraft["maxFuel"],
-                    fuel_rate=aircraft["fuelRate"],
-                    range=aircraft["range"],
-                    route=aircraft["route"],
-                    selected=aircraft["selected"],
-                    side_color=aircraft["sideColor"],
-                    weapons=aircraft_weapons,
-                    home_base_id=aircraft["homeBaseId"],
-                    rtb=aircraft["rtb"],
-                    target_id=(
-                        aircraft["targetId"] if "targetId" in aircraft.keys() else ""
-                    ),
-                )
-            )
-        for airbase in saved_scenario["airbases"]:
-            airbase_aircraft = []
-            for aircraft in airbase["aircraft"]:
-                aircraft_weapons = []
-                if aircraft["weapons"]:
-                    for weapon in aircraft["weapons"]:
-                        aircraft_weapons.append(
-                            Weapon(
-                                id=weapon["id"],
-                                name=weapon["name"],
-                                side_id=weapon["sideId"],
-                                class_name=weapon["className"],
-                                latitude=weapon["latitude"],
-                                longitude=weapon["longitude"],
-                                altitude=weapon["altitude"],
-                                heading=weapon["heading"],
-                                speed=weapon["speed"],
-                                current_fuel=weapon["currentFuel"],
-                                max_fuel=weapon["maxFuel"],
-                                fuel_rate=weapon["fuelRate"],
-                                range=weapon["range"],
-                                route=weapon["route"],
-                                side_color=weapon["sideColor"],
-                                target_id=weapon["targetId"],
-                                lethality=weapon["lethality"],
-                                max_quantity=weapon["maxQuantity"],
-                                current_quantity=weapon["currentQuantity"],
-                            )
-                        )
-                new_aircraft = Aircraft(
-                    id=aircraft["id"],
-                    name=aircraft["name"],
-                    side_id=aircraft["sideId"],
-                    class_name=aircraft["className"],
-                    latitude=aircraft["latitude"],
-                    longitude=aircraft["longitude"],
-                    altitude=aircraft["altitude"],
-                    heading=aircraft["heading"],
-                    speed=aircraft["speed"],
-                    current_fuel=aircraft["currentFuel"],
-                    max_fuel=aircraft["maxFuel"],
-                    fuel_rate=aircraft["fuelRate"],
-                    range=aircraft["range"],
-                    route=aircraft["route"],
-                    selected=aircraft["selected"],
-                    side_color=aircraft["sideColor"],
-                    weapons=aircraft_weapons,
-                    home_base_id=aircraft["homeBaseId"],
-                    rtb=aircraft["rtb"],
-                    target_id=(
-                        aircraft["targetId"] if "targetId" in aircraft.keys() else ""
-                    ),
-                )
-                airbase_aircraft.append(new_aircraft)
-            loaded_scenario.airbases.append(
-                Airbase(
-                    id=airbase["id"],
-                    name=airbase["name"],
-                    side_id=airbase["sideId"],
-                    class_name=airbase["className"],
-                    latitude=airbase["latitude"],
-                    longitude=airbase["longitude"],
-                    altitude=airbase["altitude"],
-                    side_color=airbase["sideColor"],
-                    aircraft=airbase_aircraft,
-                )
-            )
-        for facility in saved_scenario["facilities"]:
-            facility_weapons = []
-            if facility["weapons"]:
-                for weapon in facility["weapons"]:
-                    facility_weapons.append(
-                        Weapon(
-                            id=weapon["id"],
-                            name=weapon["name"],
-                            side_id=weapon["sideId"],
-                            class_name=weapon["className"],
-                            latitude=weapon["latitude"],
-                            longitude=weapon["longitude"],
-                            altitude=weapon["altitude"],
-                            heading=weapon["heading"],
-                            speed=weapon["speed"],
-                            current_fuel=weapon["currentFuel"],
-                            max_fuel=weapon["maxFuel"],
-                            fuel_rate=weapon["fuelRate"],
-                            range=weapon["range"],
-                            route=weapon["route"],
-                            side_color=weapon["sideColor"],
-                            target_id=weapon["targetId"],
-                            lethality=weapon["lethality"],
-                            max_quantity=weapon["maxQuantity"],
-                            current_quantity=weapon["currentQuantity"],
-                        )
-                    )
-            loaded_scenario.facilities.append(
-                Facility(
-                    id=facility["id"],
-                    name=facility["name"],
-                    side_id=facility["sideId"],
-                    class_name=facility["className"],
-                    latitude=facility["latitude"],
-                    longitude=facility["longitude"],
-                    altitude=facility["altitude"],
-                    range=facility["range"],
-                    side_color=facility["sideColor"],
-                    weapons=facility_weapons,
-                )
-            )
-        for weapon in saved_scenario["weapons"]:
-            loaded_scenario.weapons.append(
-                Weapon(
-                    id=weapon["id"],
-                    name=weapon["name"],
-                    side_id=weapon["sideId"],
-                    class_name=weapon["className"],
-                    latitude=weapon["latitude"],
-                    longitude=weapon["longitude"],
-                    altitude=weapon["altitude"],
-                    heading=weapon["heading"],
-                    speed=weapon["speed"],
-                    current_fuel=weapon["currentFuel"],
-                    max_fuel=weapon["maxFuel"],
-                    fuel_rate=weapon["fuelRate"],
-                    range=weapon["range"],
-                    route=weapon["route"],
-                    side_color=weapon["sideColor"],
-                    target_id=weapon["targetId"],
-                    lethality=weapon["lethality"],
-                    max_quantity=weapon["maxQuantity"],
-                    current_quantity=weapon["currentQuantity"],
-                )
-            )
-        for ship in saved_scenario["ships"]:
-            ship_aircraft = []
-            for aircraft in ship["aircraft"]:
-                aircraft_weapons = []
-                if aircraft["weapons"]:
-                    for weapon in aircraft["weapons"]:
-                        aircraft_weapons.append(
-                            Weapon(
-                                id=weapon["id"],
-                                name=weapon["name"],
-                                side_id=weapon["sideId"],
-                                class_name=weapon["className"],
-                                latitude=weapon["latitude"],
-                                longitude=weapon["longitude"],
-                                altitude=weapon["altitude"],
-                                heading=weapon["heading"],
-                                speed=weapon["speed"],
-                                current_fuel=weapon["currentFuel"],
-                                max_fuel=weapon["maxFuel"],
-                                fuel_rate=weapon["fuelRate"],
-                                range=weapon["range"],
-                                route=weapon["route"],
-                                side_color=weapon["sideColor"],
-                                target_id=weapon["targetId"],
-                                lethality=weapon["lethality"],
-                                max_quantity=weapon["maxQuantity"],
-                                current_quantity=weapon["currentQuantity"],
-                            )
-                        )
-                new_aircraft = Aircraft(
-                    id=aircraft["id"],
-                    name=aircraft["name"],
-                    side_id=aircraft["sideId"],
-                    class_name=aircraft["className"],
-                    latitude=aircraft["latitude"],
-                    longitude=aircraft["longitude"],
-                    altitude=aircraft["altitude"],
-                    heading=aircraft["heading"],
-                    speed=aircraft["speed"],
-                    current_fuel=aircraft["currentFuel"],
-                    max_fuel=aircraft["maxFuel"],
-                    fuel_rate=aircraft["fuelRate"],
-                    range=aircraft["range"],
-                    route=aircraft["route"],
-                    selected=aircraft["selected"],
-                    side_color=aircraft["sideColor"],
-                    weapons=aircraft_weapons,
-                    home_base_id=aircraft["homeBaseId"],
-                    rtb=aircraft["rtb"],
-                    target_id=aircraft["targetId"] if aircraft["targetId"] else "",
-                )
-                ship_aircraft.append(new_aircraft)
-            ship_weapons = []
-            if ship["weapons"]:
-                for weapon in ship["weapons"]:
-                    ship_weapons.append(
-                        Weapon(
-                            id=weapon["id"],
-                            name=weapon["name"],
-                            side_id=weapon["sideId"],
-                            class_name=weapon["className"],
-                            latitude=weapon["latitude"],
-                            longitude=weapon["longitude"],
-                            altitude=weapon["altitude"],
-                            heading=weapon["heading"],
-                            speed=weapon["speed"],
-                            current_fuel=weapon["currentFuel"],
-                            max_fuel=weapon["maxFuel"],
-                            fuel_rate=weapon["fuelRate"],
-                            range=weapon["range"],
-                            route=weapon["route"],
-                            side_color=weapon["sideColor"],
-                            target_id=weapon["targetId"],
-                            lethality=weapon["lethality"],
-                            max_quantity=weapon["maxQuantity"],
-                            current_quantity=weapon["currentQuantity"],
-                        )
-                    )
-            loaded_scenario.ships.append(
-                Ship(
-                    id=ship["id"],
-                    name=ship["name"],
-                    side_id=ship["sideId"],
-                    class_name=ship["className"],
-                    latitude=ship["latitude"],
-                    longitude=ship["longitude"],
-                    altitude=ship["altitude"],
-                    heading=ship["heading"],
-                    speed=ship["speed"],
-                    current_fuel=ship["currentFuel"],
-                    max_fuel=ship["maxFuel"],
-                    fuel_rate=ship["fuelRate"],
-                    range=ship["range"],
-                    route=ship["route"],
-                    side_color=ship["sideColor"],
-                    weapons=ship_weapons,
-                    aircraft=ship_aircraft,
-                )
-            )
-        if "referencePoints" in saved_scenario.keys():
-            for reference_point in saved_scenario["referencePoints"]:
-                loaded_scenario.reference_points.append(
-                    ReferencePoint(
-                        id=reference_point["id"],
-                        name=reference_point["name"],
-                        side_id=reference_point["sideId"],
-                        latitude=reference_point["latitude"],
-                        longitude=reference_point["longitude"],
-                        altitude=reference_point["altitude"],
-                        side_color=reference_point["sideColor"],
-                    )
-                )
-        if "missions" in saved_scenario.keys():
-            for mission in saved_scenario["missions"]:
-                if "assignedArea" in mission.keys():
-                    assigned_area = []
-                    for point in mission["assignedArea"]:
-                        assigned_area.append(
-                            ReferencePoint(
-                                id=point["id"],
-                                name=point["name"],
-                                side_id=point["sideId"],
-                                latitude=point["latitude"],
-                                longitude=point["longitude"],
-                                altitude=point["altitude"],
-                                side_color=point["sideColor"],
-                            )
-                        )
-                    loaded_scenario.missions.append(
-                        PatrolMission(
-                            id=mission["id"],
-                            name=mission["name"],
-                            side_id=mission["sideId"],
-                            assigned_unit_ids=mission["assignedUnitIds"],
-                            assigned_area=assigned_area,
-                            active=mission["active"],
-                        )
-                    )
-                else:
-                    loaded_scenario.missions.append(
-                        StrikeMission(
-                            id=mission["id"],
-                            name=mission["name"],
-                            side_id=mission["sideId"],
-                            assigned_unit_ids=mission["assignedUnitIds"],
-                            assigned_target_ids=mission["assignedTargetIds"],
-                            active=mission["active"],
-                        )
-                    )
+    def load_scenario_file(self, file_path: str) -> None:
+        import_object, loaded_scenario = load_scenario_file(file_path)
+        self._set_loaded_scenario(import_object, loaded_scenario)
 
-        self.initial_scenario = copy.deepcopy(loaded_scenario)
+    def _set_loaded_scenario(self, import_object: dict, loaded_scenario: Scenario):
+        self.current_side_id = import_object["currentSideId"]
+        self.map_view = import_object["mapView"]
+        self.initial_scenario = loaded_scenario
         self.current_scenario = loaded_scenario
+        self.time_step = 1
 
     def start_recording(self):
         self.recorder.start_recording(self.current_scenario)
 
     def record_step(self, force: bool = False):
         if self.recorder.should_record(self.current_scenario.current_time) or force:
-            self.recorder.record_step(
-                json.dumps(self.export_scenario()), self.current_scenario.current_time
-            )
+            current_step = self.export_scenario()
+            if self.recorder.recording_format != "delta":
+                current_step = export_scenario_bytes(current_step)
+            self.recorder.record_step(current_step, self.current_scenario.current_time)
 
     def export_recording(self):
         self.recorder.export_recording(self.current_scenario.current_time)
@@ -1,7 +1,18 @@
-from typing import Dict, List, Optional
+from typing import Dict, FrozenSet, List, Optional
+
+import numpy as np
 
 
 class Relationships:
+    """
+    Hostile and allied sides of each side.
+
+    Every side id is interned as a small integer (side_indices) and the
+    relationships are cached as N x N hostility and alliance matrices, which are
+    rebuilt by the methods below whenever they change. Edit relationships
+    through these methods, not by changing hostiles or allies in place.
+    """
+
     def __init__(
         self,
         hostiles: Optional[Dict[str, List[str]]] = None,
@@ -9,6 +20,44 @@ class Relationships:
     ):
         self.hostiles: Dict[str, List[str]] = hostiles if hostiles is not None else {}
         self.allies: Dict[str, List[str]] = allies if allies is not None else {}
+        self.side_indices: Dict[str, int] = {}
+        self.hostility_matrix = np.zeros((0, 0), dtype=bool)
+        self.alliance_matrix = np.zeros((0, 0), dtype=bool)
+        self._hostility_rows: List[List[bool]] = []
+        self._hostile_side_ids: Dict[str, FrozenSet[str]] = {}
+        self.rebuild_matrices()
+
+    def get_side_index(self, side_id: str) -> int:
+        """The side's row and column in the matrices, interning new sides."""
+        side_index = self.side_indices.get(side_id)
+        if side_index is None:
+            side_index = len(self.side_indices)
+            self.side_indices[side_id] = side_index
+        return side_index
+
+    def rebuild_matrices(self) -> None:
+        for side_lists in (self.hostiles, self.allies):
+            for side_id, related_ids in side_lists.items():
+                self.get_side_index(side_id)
+                for related_id in related_ids:
+                    self.get_side_index(related_id)
+        side_count = len(self.side_indices)
+        self.hostility_matrix = np.zeros((side_count, side_count), dtype=bool)
+        self.alliance_matrix = np.zeros((side_count, side_count), dtype=bool)
+        for matrix, side_lists in (
+            (self.hostility_matrix, self.hostiles),
+            (self.alliance_matrix, self.allies),
+        ):
+            for side_id, related_ids in side_lists.items():
+                for related_id in related_ids:
+                    matrix[
+                        self.side_indices[side_id], self.side_indices[related_id]
+                    ] = True
+        self._hostility_rows = self.hostility_matrix.tolist()
+        self._hostile_side_ids = {
+            side_id: frozenset(hostile_ids)
+            for side_id, hostile_ids in self.hostiles.items()
+        }
 
     def add_hostile(self, side_id: str, hostile_id: str):
         if side_id not in self.hostiles:
@@ -16,12 +65,14 @@ class Relationships:
         if hostile_id not in self.hostiles[side_id]:
             self.hostiles[side_id].append(hostile_id)
         self.remove_ally(side_id, hostile_id)
+        self.rebuild_matrices()
 
     def remove_hostile(self, side_id: str, hostile_id: str):
         if side_id in self.hostiles:
             self.hostiles[side_id] = [
                 id for id in self.hostiles[side_id] if id != hostile_id
             ]
+            self.rebuild_matrices()
 
     def add_ally(self, side_id: str, ally_id: str):
         if side_id not in self.allies:
@@ -29,16 +80,30 @@ class Relationships:
         if ally_id not in self.allies[side_id]:
             self.allies[side_id].append(ally_id)
         self.remove_hostile(side_id, ally_id)
+        self.rebuild_matrices()
 
     def remove_ally(self, side_id: str, ally_id: str):
         if side_id in self.allies:
             self.allies[side_id] = [id for id in self.allies[side_id] if id != ally_id]
+            self.rebuild_matrices()
 
     def is_ally(self, side_id: str, ally_id: str) -> bool:
-        return ally_id in self.allies.get(side_id, [])
+        side_index = self.side_indices.get(side_id)
+        ally_index = self.side_indices.get(ally_id)
+        if side_index is None or ally_index is None:
+            return False
+        return bool(self.alliance_matrix[side_index, ally_index])
 
     def is_hostile(self, side_id: str, hostile_id: str) -> bool:
-        return hostile_id in self.hostiles.get(side_id, [])
+        side_index = self.side_indices.get(side_id)
+        hostile_index = self.side_indices.get(hostile_id)
+        if side_index is None or hostile_index is None:
+            return False
+        return self._hostility_rows[side_index][hostile_index]
+
+    def get_hostile_side_ids(self, side_id: str) -> FrozenSet[str]:
+        """The side's hostiles as a set, for checking many units against one side."""
+        return self._hostile_side_ids.get(side_id, frozenset())
 
     def get_allies(self, side_id: str) -> List[str]:
         return self.allies.get(side_id, [])
@@ -49,6 +114,7 @@ class Relationships:
     def update_relationship(self, side_id: str, hostiles: List[str], allies: List[str]):
         self.hostiles[side_id] = hostiles
         self.allies[side_id] = allies
+        self.rebuild_matrices()
 
     def delete_side(self, side_id: str):
         for key in self.hostiles:
@@ -57,6 +123,7 @@ class Relationships:
             self.allies[key] = [id for id in self.allies[key] if id != side_id]
         self.hostiles.pop(side_id, None)
         self.allies.pop(side_id, None)
+        self.rebuild_matrices()
 
     def to_dict(self):
         return {
@@ -1,4 +1,5 @@
 import json
+import pickle
 
 from blade.units.Aircraft import Aircraft
 from blade.units.Ship import Ship
@@ -9,15 +10,31 @@ from blade.units.ReferencePoint import ReferencePoint
 from blade.Side import Side
 from blade.mission.PatrolMission import PatrolMission
 from blade.mission.StrikeMission import StrikeMission
-from blade.utils.utils import get_distance_between_two_points
+from blade.utils.utils import gc_paused, get_distance_between_two_points
+from blade.utils.UnitList import UnitList, WeaponList
 from blade.utils.colors import SIDE_COLOR
 from blade.Relationships import Relationships
-from blade.Doctrine import Doctrine, DoctrineType, SideDoctrine
+from blade.Doctrine import (
+    DOCTRINE_FLAGS,
+    Doctrine,
+    DoctrineType,
+    SideDoctrine,
+    build_doctrine_mask,
+)
 
 HomeBase = Airbase | Ship
 
 Target = Aircraft | Facility | Weapon | Airbase | Ship
 
+UNIT_LIST_ATTRIBUTES = {
+    "aircraft": UnitList,
+    "ships": UnitList,
+    "facilities": UnitList,
+    "airbases": UnitList,
+    "weapons": WeaponList,
+    "reference_points": UnitList,
+}
+
 
 class Scenario:
     def __init__(
@@ -56,6 +73,28 @@ class Scenario:
         self.relationships = relationships
         self.doctrine = doctrine if doctrine is not None else self.get_default_doctrine()
 
+    def __setattr__(self, name, value):
+        if name in UNIT_LIST_ATTRIBUTES:
+            unit_list_class = UNIT_LIST_ATTRIBUTES[name]
+            if type(value) is not unit_list_class:
+                value = unit_list_class(value if value is not None else [])
+        super().__setattr__(name, value)
+        if name == "doctrine":
+            self.rebuild_doctrine_masks()
+
+    def rebuild_doctrine_masks(self) -> None:
+        """
+        Caches each side's doctrine as a bitmask of DOCTRINE_FLAGS. Change
+        doctrine through update_side_doctrine, or call this after editing it.
+        """
+        self._doctrine_masks = {
+            side_id: build_doctrine_mask(side_doctrine)
+            for side_id, side_doctrine in self.doctrine.items()
+        }
+
+    def get_doctrine_mask(self, side_id: str) -> int:
+        return self._doctrine_masks.get(side_id, 0)
+
     def get_default_doctrine(self) -> Doctrine:
         default_doctrine: Doctrine = {}
         for side in self.sides:
@@ -75,12 +114,12 @@ class Scenario:
     def get_side_doctrine(self, side_id: str) -> SideDoctrine:
         if side_id not in self.doctrine:
             self.doctrine[side_id] = self.get_default_side_doctrine()
+            self.rebuild_doctrine_masks()
         return self.doctrine[side_id]
 
     def check_side_doctrine(self, side_id: str, doctrine_type: DoctrineType) -> bool:
-        if side_id not in self.doctrine:
-            return False
-        return self.doctrine[side_id].get(doctrine_type, False)
+        flag = DOCTRINE_FLAGS.get(doctrine_type, 0)
+        return self._doctrine_masks.get(side_id, 0) & flag != 0
 
     def update_side_doctrine(self, side_id: str, side_doctrine: SideDoctrine = None) -> None:
         if side_id not in self.doctrine:
@@ -89,10 +128,12 @@ class Scenario:
             for key in side_doctrine:
                 if key in self.doctrine[side_id]:
                     self.doctrine[side_id][key] = side_doctrine[key]
+        self.rebuild_doctrine_masks()
 
     def remove_side_doctrine(self, side_id: str) -> None:
         if side_id in self.doctrine:
             del self.doctrine[side_id]
+            self.rebuild_doctrine_masks()
 
     def get_side(self, side_id: str | None) -> Side | None:
         for side in self.sides:
@@ -109,48 +150,35 @@ class Scenario:
         return side.color if side is not None else SIDE_COLOR.BLACK
 
     def get_aircraft(self, aircraft_id: str) -> Aircraft | None:
-        for aircraft in self.aircraft:
-            if aircraft.id == aircraft_id:
-                return aircraft
-        return None
+        return self.aircraft.get(aircraft_id)
 
     def get_facility(self, facility_id: str) -> Facility | None:
-        for facility in self.facilities:
-            if facility.id == facility_id:
-                return facility
-        return None
+        return self.facilities.get(facility_id)
 
     def get_airbase(self, airbase_id: str) -> Airbase | None:
-        for airbase in self.airbases:
-            if airbase.id == airbase_id:
-                return airbase
-        return None
+        return self.airbases.get(airbase_id)
 
     def get_ship(self, ship_id: str) -> Ship | None:
-        for ship in self.ships:
-            if ship.id == ship_id:
-                return ship
-        return None
+        return self.ships.get(ship_id)
 
     def get_weapon(self, weapon_id: str) -> Weapon | None:
-        for weapon in self.weapons:
-            if weapon.id == weapon_id:
-                return weapon
-        return None
+        return self.weapons.get(weapon_id)
 
     def get_target(self, target_id: str) -> Target | None:
-        for target in (
-            self.aircraft + self.ships + self.facilities + self.airbases + self.weapons
+        for units in (
+            self.aircraft,
+            self.ships,
+            self.facilities,
+            self.airbases,
+            self.weapons,
         ):
-            if target.id == target_id:
+            target = units.get(target_id)
+            if target is not None:
                 return target
         return None
 
     def get_reference_point(self, reference_point_id: str) -> ReferencePoint | None:
-        for reference_point in self.reference_points:
-            if reference_point.id == reference_point_id:
-                return reference_point
-        return None
+        return self.reference_points.get(reference_point_id)
 
     def get_patrol_mission(self, mission_id: str) -> PatrolMission | None:
         for mission in self.missions:
@@ -300,7 +328,30 @@ class Scenario:
             else:
                 return obj
 
-        return serialize(self.__dict__)
+        return serialize(
+            {
+                key: value
+                for key, value in self.__dict__.items()
+                if not key.startswith("_")
+            }
+        )
 
     def toJson(self):
         return json.dumps(self.to_dict(), sort_keys=True, indent=4)
+
+    def defer_removals(self) -> None:
+        """Defers unit removals in every unit list until apply_removals."""
+        for attribute in UNIT_LIST_ATTRIBUTES:
+            getattr(self, attribute).defer_removals()
+
+    def apply_removals(self) -> None:
+        for attribute in UNIT_LIST_ATTRIBUTES:
+            getattr(self, attribute).apply_removals()
+
+    def snapshot(self) -> bytes:
+        return pickle.dumps(self, protocol=pickle.HIGHEST_PROTOCOL)
+
+    @staticmethod
+    def restore(snapshot: bytes) -> "Scenario":
+        with gc_paused():
+            return pickle.loads(snapshot)
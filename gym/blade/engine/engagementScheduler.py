@@ -0,0 +1,236 @@
+import heapq
+import math
+from typing import Any, Dict, FrozenSet, List, Optional, Set, Tuple
+
+import numpy as np
+
+from blade.engine.spatialIndex import SpatialGrid
+
+# taken off every gap so rounding never wakes a detector late
+GAP_TOLERANCE_DEGREES = 1e-9
+
+
+class EngagementScheduler:
+    """
+    Lets detectors sleep while no hostile aircraft can be inside their detection
+    range, so the engagement phases only query the threat index for detectors
+    with a near encounter.
+
+    Ranges are checked on the latitude/longitude plane, where a unit's speed does
+    not bound how far it moves in a tick, so the scheduler keeps its own clock
+    instead of counting ticks: each tick the clock advances by twice the farthest
+    any aircraft, ship or facility moved, which bounds how much closer any detector
+    and threat got. A detector whose nearest hostile aircraft is some gap outside
+    its range sleeps until the clock has advanced by that gap. Every detector wakes
+    when an aircraft appears or the hostilities change, and a detector wakes when
+    its range grows.
+
+    It also keeps the hostile aircraft each detector saw at its last check, so
+    new_contacts counts the aircraft that came into a detector's range this tick.
+    """
+
+    def __init__(self):
+        self.scenario = None
+        self.current_time: Optional[int] = None
+        self.clock = 0.0
+        # unit id -> (latitude, longitude) at the last refresh
+        self.positions: Dict[Any, Tuple[float, float]] = {}
+        self.hostility_matrix: Optional[np.ndarray] = None
+        # (wake clock, sequence, detector id), stale entries are skipped when popped
+        self.wake_queue: List[Tuple[float, int, Any]] = []
+        # detector id -> (wake clock, detection range in degrees when put to sleep)
+        self.sleeping: Dict[Any, Tuple[float, float]] = {}
+        # (detector, its hostile side ids, detected threats) of the detectors with
+        # a hostile aircraft in range this tick
+        self.encounters: List[Tuple[Any, FrozenSet[str], List[Any]]] = []
+        # detector id -> ids of the hostile aircraft in its range at its last check
+        self.contacts: Dict[Any, Set[Any]] = {}
+        self.new_contacts = 0
+        self._sequence = 0
+        self._threat_sides: List[str] = []
+        self._threat_latitudes: List[float] = []
+        self._threat_longitudes: List[float] = []
+        self._threat_coordinates: Optional[Tuple[np.ndarray, np.ndarray]] = None
+        self._hostile_masks: Dict[str, np.ndarray] = {}
+
+    def wake_all(self) -> None:
+        self.wake_queue = []
+        self.sleeping = {}
+
+    def refresh(self, scenario: Any) -> None:
+        """Advances the clock to the scenario's current tick, once per tick."""
+        if scenario is not self.scenario or (
+            self.current_time is not None and scenario.current_time < self.current_time
+        ):
+            self.scenario = scenario
+            self.positions = {}
+            self.contacts = {}
+            self.wake_all()
+        elif scenario.current_time == self.current_time:
+            return
+        self.current_time = scenario.current_time
+        self.encounters = []
+        self.new_contacts = 0
+
+        previous_positions = self.positions
+        positions = {}
+        moved = 0.0
+        aircraft_appeared = False
+        threat_sides = []
+        threat_latitudes = []
+        threat_longitudes = []
+        for aircraft in scenario.aircraft:
+            latitude = aircraft.latitude
+            longitude = aircraft.longitude
+            positions[aircraft.id] = (latitude, longitude)
+            threat_sides.append(aircraft.side_id)
+            threat_latitudes.append(latitude)
+            threat_longitudes.append(longitude)
+            previous_position = previous_positions.get(aircraft.id)
+            if previous_position is None:
+                aircraft_appeared = True
+            elif previous_position[0] != latitude or previous_position[1] != longitude:
+                moved = max(
+                    moved,
+                    math.hypot(
+                        latitude - previous_position[0],
+                        longitude - previous_position[1],
+                    ),
+                )
+        for unit_list in (scenario.ships, scenario.facilities):
+            for unit in unit_list:
+                latitude = unit.latitude
+                longitude = unit.longitude
+                positions[unit.id] = (latitude, longitude)
+                previous_position = previous_positions.get(unit.id)
+                if previous_position is not None and (
+                    previous_position[0] != latitude
+                    or previous_position[1] != longitude
+                ):
+                    moved = max(
+                        moved,
+                        math.hypot(
+                            latitude - previous_position[0],
+                            longitude - previous_position[1],
+                        ),
+                    )
+        self.positions = positions
+        self.clock += 2 * moved
+        contacts = self.contacts
+        for detector_id in [
+            detector_id for detector_id in contacts if detector_id not in positions
+        ]:
+            del contacts[detector_id]
+        self._threat_sides = threat_sides
+        self._threat_latitudes = threat_latitudes
+        self._threat_longitudes = threat_longitudes
+        self._threat_coordinates = None
+        self._hostile_masks = {}
+
+        hostility_matrix = scenario.relationships.hostility_matrix
+        if aircraft_appeared or hostility_matrix is not self.hostility_matrix:
+            self.hostility_matrix = hostility_matrix
+            self.wake_all()
+            return
+
+        wake_queue = self.wake_queue
+        sleeping = self.sleeping
+        while wake_queue and wake_queue[0][0] <= self.clock:
+            wake_clock, _, detector_id = heapq.heappop(wake_queue)
+            entry = sleeping.get(detector_id)
+            if entry is not None and entry[0] == wake_clock:
+                del sleeping[detector_id]
+
+    def get_detected_threats(
+        self,
+        threat_index: SpatialGrid,
+        detector: Any,
+        hostile_side_ids: FrozenSet[str],
+    ) -> List[Any]:
+        """
+        The threats get_detected_threats would return, or an empty list while the
+        detector sleeps. Call refresh first each tick.
+        """
+        range_degrees = detector.get_detection_range() / 60
+        entry = self.sleeping.get(detector.id)
+        if entry is not None:
+            if range_degrees <= entry[1]:
+                return []
+            del self.sleeping[detector.id]
+        threats = threat_index.query(
+            detector.latitude, detector.longitude, range_degrees
+        )
+        contacts = {
+            threat.id for threat in threats if threat.side_id in hostile_side_ids
+        }
+        if contacts:
+            previous_contacts = self.contacts.get(detector.id)
+            self.new_contacts += (
+                len(contacts - previous_contacts)
+                if previous_contacts is not None
+                else len(contacts)
+            )
+            self.contacts[detector.id] = contacts
+            self.encounters.append((detector, hostile_side_ids, threats))
+            return threats
+        self.contacts.pop(detector.id, None)
+        self._sleep(detector, range_degrees, hostile_side_ids)
+        return threats
+
+    def get_wake_gap(self) -> float:
+        """
+        How far in degrees a detector and a hostile aircraft must close before the
+        next detector wakes, infinite when none sleeps.
+        """
+        wake_queue = self.wake_queue
+        sleeping = self.sleeping
+        while wake_queue:
+            wake_clock, _, detector_id = wake_queue[0]
+            entry = sleeping.get(detector_id)
+            if entry is not None and entry[0] == wake_clock:
+                return wake_clock - self.clock
+            heapq.heappop(wake_queue)
+        return math.inf
+
+    def _get_hostile_mask(
+        self, side_id: str, hostile_side_ids: FrozenSet[str]
+    ) -> np.ndarray:
+        mask = self._hostile_masks.get(side_id)
+        if mask is None:
+            mask = self._hostile_masks[side_id] = np.fromiter(
+                (threat_side in hostile_side_ids for threat_side in self._threat_sides),
+                dtype=bool,
+                count=len(self._threat_sides),
+            )
+        return mask
+
+    def _sleep(
+        self, detector: Any, range_degrees: float, hostile_side_ids: FrozenSet[str]
+    ) -> None:
+        mask = self._get_hostile_mask(detector.side_id, hostile_side_ids)
+        if mask.any():
+            if self._threat_coordinates is None:
+                self._threat_coordinates = (
+                    np.array(self._threat_latitudes),
+                    np.array(self._threat_longitudes),
+                )
+            latitudes, longitudes = self._threat_coordinates
+            delta_latitudes = latitudes[mask] - detector.latitude
+            delta_longitudes = longitudes[mask] - detector.longitude
+            nearest_distance = math.sqrt(
+                float(
+                    np.min(
+                        delta_latitudes * delta_latitudes
+                        + delta_longitudes * delta_longitudes
+                    )
+                )
+            )
+            gap = nearest_distance - max(range_degrees, 0) - GAP_TOLERANCE_DEGREES
+            if gap <= 0:
+                return
+            wake_clock = self.clock + gap
+        else:
+            wake_clock = math.inf
+        self.sleeping[detector.id] = (wake_clock, range_degrees)
+        self._sequence += 1
+        heapq.heappush(self.wake_queue, (wake_clock, self._sequence, detector.id))
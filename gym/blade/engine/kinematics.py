@@ -0,0 +1,140 @@
+from operator import attrgetter
+
+import numpy as np
+
+from blade.units.Aircraft import Aircraft
+from blade.units.Ship import Ship
+from blade.utils.utils import (
+    get_bearings_between_points,
+    get_distances_between_points,
+    get_next_coordinates_for_points,
+)
+
+WAYPOINT_ARRIVAL_DISTANCE_KM = 0.5
+DEFAULT_KINEMATICS_CAPACITY = 256
+
+get_kinematic_state = attrgetter(
+    "latitude", "longitude", "heading", "speed", "current_fuel", "fuel_rate"
+)
+
+
+class RouteKinematics:
+    """
+    Structure-of-arrays buffers for units that follow a route (aircraft, ships).
+
+    Each tick the units are gathered into contiguous arrays, advanced towards the
+    head of their route with one batched great-circle update and written back.
+    The per-unit results match get_next_coordinates / get_bearing_between_two_points.
+    """
+
+    def __init__(self, capacity: int = DEFAULT_KINEMATICS_CAPACITY):
+        self.capacity = 0
+        self.count = 0
+        self._allocate(capacity)
+
+    def _allocate(self, capacity: int) -> None:
+        self.capacity = capacity
+        self.latitude = np.zeros(capacity)
+        self.longitude = np.zeros(capacity)
+        self.heading = np.zeros(capacity)
+        self.speed = np.zeros(capacity)
+        self.current_fuel = np.zeros(capacity)
+        self.fuel_rate = np.zeros(capacity)
+        self.waypoint_latitude = np.zeros(capacity)
+        self.waypoint_longitude = np.zeros(capacity)
+        self.has_waypoint = np.zeros(capacity, dtype=bool)
+
+    def reserve(self, count: int) -> None:
+        if count > self.capacity:
+            self._allocate(max(count, self.capacity * 2))
+
+    def load(self, units: list[Aircraft | Ship]) -> None:
+        count = len(units)
+        self.reserve(count)
+        self.count = count
+        state = np.array([get_kinematic_state(unit) for unit in units], dtype=float)
+        self.latitude[:count] = state[:, 0]
+        self.longitude[:count] = state[:, 1]
+        self.heading[:count] = state[:, 2]
+        self.speed[:count] = state[:, 3]
+        self.current_fuel[:count] = state[:, 4]
+        self.fuel_rate[:count] = state[:, 5]
+        # units without a route hold position on their own coordinates
+        waypoints = np.array(
+            [
+                unit.route[0][:2] if len(unit.route) > 0 else (np.nan, np.nan)
+                for unit in units
+            ],
+            dtype=float,
+        )
+        has_waypoint = ~np.isnan(waypoints[:, 0])
+        self.has_waypoint[:count] = has_waypoint
+        self.waypoint_latitude[:count] = np.where(
+            has_waypoint, waypoints[:, 0], state[:, 0]
+        )
+        self.waypoint_longitude[:count] = np.where(
+            has_waypoint, waypoints[:, 1], state[:, 1]
+        )
+
+    def advance(self, units: list[Aircraft | Ship], seconds: float = 1) -> None:
+        """Move every unit along its route and burn fuel for the given seconds."""
+        if len(units) == 0:
+            return
+        self.load(units)
+        count = self.count
+
+        latitude = self.latitude[:count]
+        longitude = self.longitude[:count]
+        waypoint_latitude = self.waypoint_latitude[:count]
+        waypoint_longitude = self.waypoint_longitude[:count]
+        has_waypoint = self.has_waypoint[:count]
+
+        distance_to_waypoint_km = get_distances_between_points(
+            latitude, longitude, waypoint_latitude, waypoint_longitude
+        )
+        arrived = has_waypoint & (
+            distance_to_waypoint_km < WAYPOINT_ARRIVAL_DISTANCE_KM
+        )
+        moving = has_waypoint & ~arrived
+
+        if moving.any():
+            next_latitude, next_longitude = get_next_coordinates_for_points(
+                latitude[moving],
+                longitude[moving],
+                waypoint_latitude[moving],
+                waypoint_longitude[moving],
+                self.speed[:count][moving],
+                seconds,
+            )
+            latitude[moving] = next_latitude
+            longitude[moving] = next_longitude
+            self.heading[:count][moving] = get_bearings_between_points(
+                next_latitude,
+                next_longitude,
+                waypoint_latitude[moving],
+                waypoint_longitude[moving],
+            )
+        latitude[arrived] = waypoint_latitude[arrived]
+        longitude[arrived] = waypoint_longitude[arrived]
+
+        current_fuel = self.current_fuel[:count]
+        current_fuel -= self.fuel_rate[:count] / 3600 * seconds
+
+        self.store(units, arrived)
+
+    def store(self, units: list[Aircraft | Ship], arrived: np.ndarray) -> None:
+        count = self.count
+        latitude = self.latitude[:count].tolist()
+        longitude = self.longitude[:count].tolist()
+        heading = self.heading[:count].tolist()
+        current_fuel = self.current_fuel[:count].tolist()
+        has_waypoint = self.has_waypoint[:count].tolist()
+        arrived = arrived.tolist()
+        for index, unit in enumerate(units):
+            if has_waypoint[index]:
+                unit.latitude = latitude[index]
+                unit.longitude = longitude[index]
+                unit.heading = heading[index]
+                if arrived[index]:
+                    unit.route.pop(0)
+            unit.current_fuel = current_fuel[index]
@@ -0,0 +1,94 @@
+import math
+from typing import Any, Dict, List, Tuple
+
+DEFAULT_GRID_CELL_SIZE_DEGREES = 5.0
+
+
+class SpatialGrid:
+    """
+    Uniform latitude/longitude bucket grid over a list of units.
+
+    Distances are measured in degrees on the plane, the same way detection ranges
+    are checked elsewhere in the engine (range in nautical miles / 60).
+    """
+
+    def __init__(self, cell_size_degrees: float = DEFAULT_GRID_CELL_SIZE_DEGREES):
+        self.cell_size_degrees = cell_size_degrees
+        self.cells: Dict[Tuple[int, int], List[Tuple[int, float, float, Any]]] = {}
+        self.min_row = 0
+        self.max_row = -1
+        self.min_column = 0
+        self.max_column = -1
+
+    def _get_cell(self, latitude: float, longitude: float) -> Tuple[int, int]:
+        return (
+            math.floor(latitude / self.cell_size_degrees),
+            math.floor(longitude / self.cell_size_degrees),
+        )
+
+    def build(self, units: List[Any]) -> None:
+        self.cells = {}
+        rows = []
+        columns = []
+        for index, unit in enumerate(units):
+            cell = self._get_cell(unit.latitude, unit.longitude)
+            bucket = self.cells.get(cell)
+            if bucket is None:
+                bucket = self.cells[cell] = []
+                rows.append(cell[0])
+                columns.append(cell[1])
+            bucket.append((index, unit.latitude, unit.longitude, unit))
+        if len(self.cells) > 0:
+            self.min_row, self.max_row = min(rows), max(rows)
+            self.min_column, self.max_column = min(columns), max(columns)
+        else:
+            self.min_row, self.max_row = 0, -1
+            self.min_column, self.max_column = 0, -1
+
+    def query(
+        self, latitude: float, longitude: float, radius_degrees: float
+    ) -> List[Any]:
+        """Units strictly inside the radius, in the order they were indexed."""
+        if radius_degrees <= 0 or len(self.cells) == 0:
+            return []
+        first_row, first_column = self._get_cell(
+            latitude - radius_degrees, longitude - radius_degrees
+        )
+        last_row, last_column = self._get_cell(
+            latitude + radius_degrees, longitude + radius_degrees
+        )
+        first_row = max(first_row, self.min_row)
+        last_row = min(last_row, self.max_row)
+        first_column = max(first_column, self.min_column)
+        last_column = min(last_column, self.max_column)
+
+        if (last_row - first_row + 1) * (last_column - first_column + 1) > len(
+            self.cells
+        ):
+            buckets = [
+                bucket
+                for (row, column), bucket in self.cells.items()
+                if first_row <= row <= last_row
+                and first_column <= column <= last_column
+            ]
+        else:
+            buckets = []
+            for row in range(first_row, last_row + 1):
+                for column in range(first_column, last_column + 1):
+                    bucket = self.cells.get((row, column))
+                    if bucket is not None:
+                        buckets.append(bucket)
+
+        radius_squared = radius_degrees * radius_degrees
+        matches = []
+        for bucket in buckets:
+            for entry in bucket:
+                delta_latitude = entry[1] - latitude
+                delta_longitude = entry[2] - longitude
+                if (
+                    delta_latitude * delta_latitude + delta_longitude * delta_longitude
+                    < radius_squared
+                ):
+                    matches.append(entry)
+        matches.sort(key=lambda entry: entry[0])
+        return [entry[3] for entry in matches]
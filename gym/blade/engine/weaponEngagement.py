@@ -1,12 +1,15 @@
+from typing import List, Optional
+
+import numpy as np
+
 from blade.units.Aircraft import Aircraft
 from blade.units.Ship import Ship
 from blade.units.Facility import Facility
 from blade.units.Airbase import Airbase
 from blade.units.Weapon import Weapon
 from blade.Scenario import Scenario
-from shapely.geometry import Point
-from uuid import uuid4
 
+from blade.engine.spatialIndex import SpatialGrid
 from blade.utils.constants import NAUTICAL_MILES_TO_METERS
 from blade.utils.utils import (
     get_bearing_between_two_points,
@@ -14,7 +17,6 @@ from blade.utils.utils import (
     get_next_coordinates,
     get_terminal_coordinates_from_distance_and_bearing,
     random_float,
-    random_int,
 )
 
 Target = Aircraft | Facility | Weapon | Airbase | Ship
@@ -23,12 +25,28 @@ Target = Aircraft | Facility | Weapon | Airbase | Ship
 def is_threat_detected(
     threat: Aircraft | Weapon, detector: Facility | Ship | Aircraft
 ) -> bool:
-    detector_geometry = Point([detector.latitude, detector.longitude]).buffer(
+    detection_range = (
         detector.get_detection_range()
         / 60  # rough conversion from nautical miles to degrees
     )
-    threat_geometry = Point([threat.latitude, threat.longitude])
-    return detector_geometry.contains(threat_geometry)
+    if detection_range <= 0:
+        return False
+    delta_latitude = threat.latitude - detector.latitude
+    delta_longitude = threat.longitude - detector.longitude
+    return (
+        delta_latitude * delta_latitude + delta_longitude * delta_longitude
+        < detection_range * detection_range
+    )
+
+
+def get_detected_threats(
+    threat_index: SpatialGrid, detector: Facility | Ship | Aircraft
+) -> list[Aircraft | Weapon]:
+    return threat_index.query(
+        detector.latitude,
+        detector.longitude,
+        detector.get_detection_range() / 60,
+    )
 
 
 def weapon_can_engage_target(target: Target, weapon: Weapon) -> bool:
@@ -44,16 +62,21 @@ def weapon_can_engage_target(target: Target, weapon: Weapon) -> bool:
 
 
 def check_target_tracked_by_count(current_scenario: Scenario, target: Target) -> int:
-    count = 0
-    for weapon in current_scenario.weapons:
-        if weapon.target_id == target.id:
-            count += 1
-    return count
+    return current_scenario.weapons.count_targeting(target.id)
 
 
-def weapon_endgame(current_scenario: Scenario, weapon: Weapon, target: Target) -> bool:
+def remove_weapon(current_scenario: Scenario, weapon: Weapon) -> None:
     current_scenario.weapons.remove(weapon)
-    if random_float(0, 1) <= weapon.lethality:
+
+
+def weapon_endgame(
+    current_scenario: Scenario,
+    weapon: Weapon,
+    target: Target,
+    rng: Optional[np.random.Generator] = None,
+) -> bool:
+    remove_weapon(current_scenario, weapon)
+    if random_float(0, 1, rng) <= weapon.lethality:
         if isinstance(target, Aircraft):
             current_scenario.aircraft.remove(target)
         elif isinstance(target, Ship):
@@ -63,11 +86,49 @@ def weapon_endgame(current_scenario: Scenario, weapon: Weapon, target: Target) -
         elif isinstance(target, Airbase):
             current_scenario.airbases.remove(target)
         elif isinstance(target, Weapon):
-            current_scenario.weapons.remove(target)
+            remove_weapon(current_scenario, target)
         return True
     return False
 
 
+def create_launched_weapon(
+    template: Weapon,
+    weapon_id: int,
+    side_id: str,
+    latitude: float,
+    longitude: float,
+    heading: float,
+    target_id: str,
+    route: List[List[float]],
+) -> Weapon:
+    """
+    A single in-flight round of the template weapon, headed for the target. The
+    integer id only becomes a uuid-shaped string when the scenario is exported
+    (see format_unit_id).
+    """
+    weapon = Weapon.__new__(Weapon)
+    weapon.id = weapon_id
+    weapon.name = f"{template.name} #{weapon_id}"
+    weapon.side_id = side_id
+    weapon.class_name = template.class_name
+    weapon.latitude = latitude
+    weapon.longitude = longitude
+    weapon.altitude = template.altitude
+    weapon.heading = heading
+    weapon.speed = template.speed
+    weapon.current_fuel = template.current_fuel
+    weapon.max_fuel = template.max_fuel
+    weapon.fuel_rate = template.fuel_rate
+    weapon.range = template.range
+    weapon.target_id = target_id
+    weapon.lethality = template.lethality
+    weapon.max_quantity = 1
+    weapon.current_quantity = 1
+    weapon.route = route
+    weapon.side_color = template.side_color
+    return weapon
+
+
 def launch_weapon(
     current_scenario: Scenario,
     origin: Facility | Ship | Aircraft,
@@ -91,31 +152,20 @@ def launch_weapon(
         )
         next_weapon_latitude = next_weapon_coordinates[0]
         next_weapon_longitude = next_weapon_coordinates[1]
-        new_weapon = Weapon(
-            id=str(uuid4()),
-            name=f"{launched_weapon.name} #{random_int(0, 1000)}",
+        new_weapon = create_launched_weapon(
+            launched_weapon,
+            current_scenario.weapons.take_launch_id(origin.side_id),
             side_id=origin.side_id,
-            class_name=launched_weapon.class_name,
             latitude=next_weapon_latitude,
             longitude=next_weapon_longitude,
-            altitude=launched_weapon.altitude,
             heading=get_bearing_between_two_points(
                 next_weapon_latitude,
                 next_weapon_longitude,
                 target.latitude,
                 target.longitude,
             ),
-            speed=launched_weapon.speed,
-            current_fuel=launched_weapon.current_fuel,
-            max_fuel=launched_weapon.max_fuel,
-            fuel_rate=launched_weapon.fuel_rate,
-            range=launched_weapon.range,
-            route=[[target.latitude, target.longitude]],
-            side_color=launched_weapon.side_color,
             target_id=target.id,
-            lethality=launched_weapon.lethality,
-            current_quantity=1,
-            max_quantity=1,
+            route=[[target.latitude, target.longitude]],
         )
         current_scenario.weapons.append(new_weapon)
     launched_weapon.current_quantity -= launched_weapon_quantity
@@ -123,10 +173,15 @@ def launch_weapon(
         origin.weapons.remove(launched_weapon)
 
 
-def weapon_engagement(current_scenario: Scenario, weapon: Weapon) -> None:
+def weapon_engagement(
+    current_scenario: Scenario,
+    weapon: Weapon,
+    rng: Optional[np.random.Generator] = None,
+) -> bool | None:
+    """Returns the endgame result if the weapon reached its target this tick."""
     target = current_scenario.get_target(weapon.target_id)
     if target is None:
-        current_scenario.weapons.remove(weapon)
+        remove_weapon(current_scenario, weapon)
     else:
         weapon_route = weapon.route
         if len(weapon_route) > 0:
@@ -140,7 +195,7 @@ def weapon_engagement(current_scenario: Scenario, weapon: Weapon) -> None:
                 )
                 < 1
             ):
-                weapon_endgame(current_scenario, weapon, target)
+                return weapon_endgame(current_scenario, weapon, target, rng)
             else:
                 next_weapon_coordinates = get_next_coordinates(
                     weapon.latitude,
@@ -161,7 +216,7 @@ def weapon_engagement(current_scenario: Scenario, weapon: Weapon) -> None:
                 weapon.longitude = next_weapon_longitude
                 weapon.current_fuel -= weapon.fuel_rate / 3600
                 if weapon.current_fuel <= 0:
-                    current_scenario.weapons.remove(weapon)
+                    remove_weapon(current_scenario, weapon)
 
 
 def aircraft_pursuit(
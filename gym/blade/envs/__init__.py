@@ -1 +1,2 @@
 from blade.envs.blade import BLADE
+from blade.envs.observation import ObservationEncoder
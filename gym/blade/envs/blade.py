@@ -4,6 +4,7 @@ from gymnasium.spaces import Text
 
 from blade.Game import Game
 from blade.Scenario import Scenario
+from blade.envs.observation import ObservationEncoder
 from blade.utils.constants import (
     BLADE_ENV_OBSERVATION_SPACE_MAX_CHARACTERS,
     BLADE_ENV_ACTION_SPACE_MAX_CHARACTERS,
@@ -22,8 +23,15 @@ class BLADE(gym.Env):
         observation_filter_fnc=None,
         reward_filter_fnc=None,
         termination_filter_fnc=None,
+        observation_encoder: ObservationEncoder = None,
     ):
-        if observation_space is None:
+        if observation_encoder is not None and observation_filter_fnc is not None:
+            raise ValueError(
+                "Use either observation_encoder or observation_filter_fnc, not both"
+            )
+        if observation_space is None and observation_encoder is not None:
+            self.observation_space = observation_encoder.observation_space
+        elif observation_space is None:
             self.observation_space = Text(
                 max_length=BLADE_ENV_OBSERVATION_SPACE_MAX_CHARACTERS
             )
@@ -35,6 +43,7 @@ class BLADE(gym.Env):
             self.action_space = action_space
         self.action_transform_fnc = action_transform_fnc
         self.observation_filter_fnc = observation_filter_fnc
+        self.observation_encoder = observation_encoder
         self.reward_filter_fnc = reward_filter_fnc
         self.termination_filter_fnc = termination_filter_fnc
         self.render_mode = render_mode
@@ -44,13 +53,16 @@ class BLADE(gym.Env):
         obs = self.game._get_observation()
         if self.observation_filter_fnc is not None:
             obs = self.observation_filter_fnc(obs)
+        elif self.observation_encoder is not None:
+            obs = self.observation_encoder.encode(obs)
         return obs
 
     def _get_info(self):
         return self.game._get_info()
 
     def reset(self, seed=None, options=None):
-        self.game.reset()
+        super().reset(seed=seed)
+        self.game.reset(seed=seed)
         observation = self._get_obs()
         info = self._get_info()
         return observation, info
@@ -65,6 +77,12 @@ class BLADE(gym.Env):
             terminated = self.termination_filter_fnc(observation)
         if self.observation_filter_fnc is not None:
             observation = self.observation_filter_fnc(observation)
+        elif self.observation_encoder is not None:
+            # the encoder reuses its arrays, and vector envs keep the last
+            # observation of an episode after resetting
+            observation = self.observation_encoder.encode(
+                observation, copy=terminated or truncated
+            )
         return observation, reward, terminated, truncated, info
 
     def export_scenario(self, file_path: str = None):
@@ -0,0 +1,155 @@
+from typing import Dict, Optional
+
+import numpy as np
+from gymnasium.spaces import Box, Dict as DictSpace, MultiBinary
+
+from blade.Scenario import Scenario
+
+UNIT_TYPES = ("aircraft", "ship", "facility", "airbase", "weapon")
+OBSERVATION_FEATURES = (
+    "side",
+    "unit_type",
+    "latitude",
+    "longitude",
+    "heading",
+    "speed",
+    "fuel",
+    "weapons",
+    "has_target",
+    "is_targeted",
+)
+DEFAULT_MAX_UNITS = {
+    "aircraft": 64,
+    "ship": 16,
+    "facility": 32,
+    "airbase": 8,
+    "weapon": 128,
+}
+
+
+class ObservationEncoder:
+    """
+    Encodes a Scenario into fixed-size arrays for the BLADE env.
+
+    Each unit type gets a fixed block of rows in "units" (aircraft first, then
+    ships, facilities, airbases and weapons) with one column per entry in
+    OBSERVATION_FEATURES, and "mask" marks which rows hold a unit. Units past a
+    block's capacity are dropped. Fuel is the fraction of max fuel, above 1 when a
+    scenario fuels a unit past its max fuel. Weapons is the number of rounds
+    carried, has_target and is_targeted are 0/1 flags.
+
+    The arrays are allocated once and overwritten by every encode call, so pass
+    copy=True, or copy them, if an observation needs to outlive the next step.
+    """
+
+    def __init__(self, max_units: Optional[Dict[str, int]] = None):
+        self.max_units = dict(DEFAULT_MAX_UNITS)
+        if max_units is not None:
+            unknown_types = set(max_units) - set(UNIT_TYPES)
+            if unknown_types:
+                raise ValueError(f"Unknown unit types: {sorted(unknown_types)}")
+            self.max_units.update(max_units)
+        self.offsets = {}
+        total_units = 0
+        for unit_type in UNIT_TYPES:
+            self.offsets[unit_type] = total_units
+            total_units += self.max_units[unit_type]
+        self.total_units = total_units
+
+        num_features = len(OBSERVATION_FEATURES)
+        low = np.full(num_features, -np.inf, dtype=np.float32)
+        high = np.full(num_features, np.inf, dtype=np.float32)
+        for feature, feature_low, feature_high in (
+            ("side", -1, np.inf),
+            ("unit_type", 0, len(UNIT_TYPES) - 1),
+            ("latitude", -90, 90),
+            ("longitude", -180, 180),
+            ("speed", 0, np.inf),
+            ("fuel", 0, np.inf),
+            ("weapons", 0, np.inf),
+            ("has_target", 0, 1),
+            ("is_targeted", 0, 1),
+        ):
+            low[OBSERVATION_FEATURES.index(feature)] = feature_low
+            high[OBSERVATION_FEATURES.index(feature)] = feature_high
+        self.observation_space = DictSpace(
+            {
+                "units": Box(
+                    low=np.tile(low, (total_units, 1)),
+                    high=np.tile(high, (total_units, 1)),
+                    dtype=np.float32,
+                ),
+                "mask": MultiBinary(total_units),
+            }
+        )
+        self.units = np.zeros((total_units, num_features), dtype=np.float32)
+        self.mask = np.zeros(total_units, dtype=np.int8)
+        self.observation = {"units": self.units, "mask": self.mask}
+        # one view per feature, so rows are written without building tuples
+        self._columns = [self.units[:, column] for column in range(num_features)]
+
+        self._scenario = None
+        self._side_indices: Dict[str, int] = {}
+
+    def _get_side_index(self, side_id: str) -> int:
+        side_index = self._side_indices.get(side_id)
+        if side_index is None:
+            self._side_indices = {
+                side.id: index for index, side in enumerate(self._scenario.sides)
+            }
+            side_index = self._side_indices.get(side_id, -1)
+        return side_index
+
+    def _encode_block(self, unit_type: str, units: list, scenario: Scenario) -> None:
+        start = self.offsets[unit_type]
+        capacity = self.max_units[unit_type]
+        count = min(len(units), capacity)
+        (
+            sides,
+            unit_types,
+            latitudes,
+            longitudes,
+            headings,
+            speeds,
+            fuels,
+            weapon_counts,
+            has_targets,
+            is_targeteds,
+        ) = self._columns
+        count_targeting = scenario.weapons.count_targeting
+        unit_types[start : start + count] = UNIT_TYPES.index(unit_type)
+        for row, unit in zip(range(start, start + count), units):
+            max_fuel = getattr(unit, "max_fuel", 0)
+            if unit_type == "weapon":
+                weapons = unit.current_quantity
+            else:
+                weapons = 0
+                for weapon in getattr(unit, "weapons", ()):
+                    weapons += weapon.current_quantity
+            sides[row] = self._get_side_index(unit.side_id)
+            latitudes[row] = unit.latitude
+            longitudes[row] = unit.longitude
+            headings[row] = getattr(unit, "heading", 0)
+            speeds[row] = getattr(unit, "speed", 0)
+            fuels[row] = (
+                getattr(unit, "current_fuel", 0) / max_fuel if max_fuel > 0 else 0
+            )
+            weapon_counts[row] = weapons
+            has_targets[row] = getattr(unit, "target_id", "") != ""
+            is_targeteds[row] = count_targeting(unit.id) > 0
+        self.units[start + count : start + capacity] = 0
+        self.mask[start : start + count] = 1
+        self.mask[start + count : start + capacity] = 0
+
+    def encode(self, scenario: Scenario, copy: bool = False) -> Dict[str, np.ndarray]:
+        if scenario is not self._scenario:
+            self._scenario = scenario
+            self._side_indices = {}
+        self._encode_block("aircraft", scenario.aircraft, scenario)
+        self._encode_block("ship", scenario.ships, scenario)
+        self._encode_block("facility", scenario.facilities, scenario)
+        self._encode_block("airbase", scenario.airbases, scenario)
+        self._encode_block("weapon", scenario.weapons, scenario)
+        if copy:
+            return {"units": self.units.copy(), "mask": self.mask.copy()}
+        return self.observation
@@ -0,0 +1,323 @@
+import math
+import multiprocessing as mp
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Type
+
+import gymnasium as gym
+import numpy as np
+from gymnasium import spaces
+from stable_baselines3.common.vec_env.base_vec_env import (
+    CloudpickleWrapper,
+    VecEnv,
+    VecEnvIndices,
+    VecEnvObs,
+    VecEnvStepReturn,
+)
+
+NUMERIC_SPACES = (spaces.Box, spaces.Discrete, spaces.MultiDiscrete, spaces.MultiBinary)
+
+
+def _get_space_layout(space: spaces.Space) -> Dict[str | None, Tuple[tuple, Any]]:
+    """Shape and dtype of every array an observation or action is made of."""
+    if isinstance(space, spaces.Dict):
+        layout = {}
+        for key, subspace in space.spaces.items():
+            if not isinstance(subspace, NUMERIC_SPACES):
+                raise ValueError(
+                    f"BLADEVecEnv cannot share '{key}' of type {type(subspace).__name__}, "
+                    "use an observation_filter_fnc that returns numeric arrays"
+                )
+            layout[key] = (tuple(subspace.shape), np.dtype(subspace.dtype))
+        return layout
+    if not isinstance(space, NUMERIC_SPACES):
+        raise ValueError(
+            f"BLADEVecEnv cannot share spaces of type {type(space).__name__}, "
+            "the BLADE env needs numeric observation and action spaces"
+        )
+    return {None: (tuple(space.shape), np.dtype(space.dtype))}
+
+
+class SharedBuffers:
+    """
+    Per-env observation, action, reward and done arrays backed by shared memory.
+
+    The parent allocates the buffers before the workers start and every worker
+    attaches to the same memory, so a step only sends a short command over the pipe.
+    """
+
+    def __init__(
+        self,
+        ctx,
+        num_envs: int,
+        observation_space: spaces.Space,
+        action_space: spaces.Space,
+    ):
+        self.num_envs = num_envs
+        self.observation_layout = _get_space_layout(observation_space)
+        self.action_layout = _get_space_layout(action_space)
+        self.layout: Dict[str, Tuple[tuple, Any]] = {}
+        for key, (shape, dtype) in self.observation_layout.items():
+            self.layout[f"observation/{key}"] = (shape, dtype)
+            self.layout[f"terminal_observation/{key}"] = (shape, dtype)
+        for key, (shape, dtype) in self.action_layout.items():
+            self.layout[f"action/{key}"] = (shape, dtype)
+        self.layout["reward"] = ((), np.dtype(np.float32))
+        self.layout["done"] = ((), np.dtype(np.bool_))
+        self.raw_arrays = {
+            name: ctx.RawArray(
+                "b", max(1, num_envs * math.prod(shape) * dtype.itemsize)
+            )
+            for name, (shape, dtype) in self.layout.items()
+        }
+        self._attach()
+
+    def _attach(self) -> None:
+        self.arrays: Dict[str, np.ndarray] = {
+            name: np.frombuffer(self.raw_arrays[name], dtype=dtype)[
+                : self.num_envs * math.prod(shape)
+            ].reshape((self.num_envs,) + shape)
+            for name, (shape, dtype) in self.layout.items()
+        }
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state["arrays"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._attach()
+
+    def write_observation(self, prefix: str, env_index: int, observation) -> None:
+        for key in self.observation_layout:
+            value = observation if key is None else observation[key]
+            self.arrays[f"{prefix}/{key}"][env_index] = value
+
+    def read_observation(
+        self, prefix: str, env_index: Optional[int] = None
+    ) -> VecEnvObs:
+        observation = {}
+        for key in self.observation_layout:
+            array = self.arrays[f"{prefix}/{key}"]
+            observation[key] = (
+                array.copy() if env_index is None else array[env_index].copy()
+            )
+        if None in observation:
+            return observation[None]
+        return observation
+
+    def write_action(self, actions) -> None:
+        for key in self.action_layout:
+            self.arrays[f"action/{key}"][:] = actions if key is None else actions[key]
+
+    def read_action(self, env_index: int):
+        action = {
+            key: self.arrays[f"action/{key}"][env_index].copy()
+            for key in self.action_layout
+        }
+        if None in action:
+            return action[None]
+        return action
+
+
+def _worker(
+    remote,
+    parent_remote,
+    env_fn_wrapper: CloudpickleWrapper,
+    env_index: int,
+    buffers: SharedBuffers,
+) -> None:
+    # Import here to avoid a circular import
+    from stable_baselines3.common.env_util import is_wrapped
+
+    parent_remote.close()
+    env = env_fn_wrapper.var()
+    rewards = buffers.arrays["reward"]
+    dones = buffers.arrays["done"]
+    while True:
+        try:
+            cmd, data = remote.recv()
+            if cmd == "step":
+                observation, reward, terminated, truncated, info = env.step(
+                    buffers.read_action(env_index)
+                )
+                done = terminated or truncated
+                info["TimeLimit.truncated"] = truncated and not terminated
+                reset_info = {}
+                if done:
+                    buffers.write_observation(
+                        "terminal_observation", env_index, observation
+                    )
+                    observation, reset_info = env.reset()
+                buffers.write_observation("observation", env_index, observation)
+                rewards[env_index] = reward
+                dones[env_index] = done
+                remote.send((info, reset_info))
+            elif cmd == "reset":
+                maybe_options = {"options": data[1]} if data[1] else {}
+                observation, reset_info = env.reset(seed=data[0], **maybe_options)
+                buffers.write_observation("observation", env_index, observation)
+                remote.send(reset_info)
+            elif cmd == "render":
+                remote.send(env.render())
+            elif cmd == "close":
+                env.close()
+                remote.close()
+                break
+            elif cmd == "env_method":
+                method = env.get_wrapper_attr(data[0])
+                remote.send(method(*data[1], **data[2]))
+            elif cmd == "get_attr":
+                remote.send(env.get_wrapper_attr(data))
+            elif cmd == "set_attr":
+                remote.send(setattr(env, data[0], data[1]))
+            elif cmd == "is_wrapped":
+                remote.send(is_wrapped(env, data))
+            else:
+                raise NotImplementedError(f"`{cmd}` is not implemented in the worker")
+        except EOFError:
+            break
+
+
+class BLADEVecEnv(VecEnv):
+    """
+    Runs one BLADE env per worker process and steps them together.
+
+    Actions, observations, rewards and dones go through shared memory instead of
+    being pickled, so the observation and action spaces must be numeric (Box,
+    Discrete, MultiDiscrete, MultiBinary or a Dict of those). Use the env's
+    observation_filter_fnc and action_transform_fnc to map between these arrays and
+    the Scenario. Finished episodes are reset in the worker and their last
+    observation is returned in info["terminal_observation"], like SubprocVecEnv.
+
+    With the 'forkserver' or 'spawn' start methods the training code must be
+    wrapped in an ``if __name__ == "__main__":`` block.
+    """
+
+    def __init__(
+        self,
+        env_fns: List[Callable[[], gym.Env]],
+        start_method: Optional[str] = None,
+        observation_space: Optional[spaces.Space] = None,
+        action_space: Optional[spaces.Space] = None,
+    ):
+        self.waiting = False
+        self.closed = False
+        num_envs = len(env_fns)
+
+        if observation_space is None or action_space is None:
+            probe_env = env_fns[0]()
+            if observation_space is None:
+                observation_space = probe_env.observation_space
+            if action_space is None:
+                action_space = probe_env.action_space
+            probe_env.close()
+
+        if start_method is None:
+            forkserver_available = "forkserver" in mp.get_all_start_methods()
+            start_method = "forkserver" if forkserver_available else "spawn"
+        ctx = mp.get_context(start_method)
+
+        self.buffers = SharedBuffers(ctx, num_envs, observation_space, action_space)
+        self.remotes, self.work_remotes = zip(*[ctx.Pipe() for _ in range(num_envs)])
+        self.processes = []
+        for env_index, (work_remote, remote, env_fn) in enumerate(
+            zip(self.work_remotes, self.remotes, env_fns)
+        ):
+            args = (
+                work_remote,
+                remote,
+                CloudpickleWrapper(env_fn),
+                env_index,
+                self.buffers,
+            )
+            process = ctx.Process(target=_worker, args=args, daemon=True)
+            process.start()
+            self.processes.append(process)
+            work_remote.close()
+
+        super().__init__(num_envs, observation_space, action_space)
+
+    def step_async(self, actions: np.ndarray) -> None:
+        self.buffers.write_action(actions)
+        for remote in self.remotes:
+            remote.send(("step", None))
+        self.waiting = True
+
+    def step_wait(self) -> VecEnvStepReturn:
+        results = [remote.recv() for remote in self.remotes]
+        self.waiting = False
+        infos, self.reset_infos = zip(*results)
+        dones = self.buffers.arrays["done"].copy()
+        for env_index in np.flatnonzero(dones):
+            infos[env_index]["terminal_observation"] = self.buffers.read_observation(
+                "terminal_observation", env_index
+            )
+        return (
+            self.buffers.read_observation("observation"),
+            self.buffers.arrays["reward"].copy(),
+            dones,
+            infos,
+        )
+
+    def reset(self) -> VecEnvObs:
+        for env_index, remote in enumerate(self.remotes):
+            remote.send(("reset", (self._seeds[env_index], self._options[env_index])))
+        self.reset_infos = [remote.recv() for remote in self.remotes]
+        self._reset_seeds()
+        self._reset_options()
+        return self.buffers.read_observation("observation")
+
+    def close(self) -> None:
+        if self.closed:
+            return
+        if self.waiting:
+            for remote in self.remotes:
+                remote.recv()
+        for remote in self.remotes:
+            remote.send(("close", None))
+        for process in self.processes:
+            process.join()
+        self.closed = True
+
+    def get_images(self) -> Sequence[Optional[np.ndarray]]:
+        for remote in self.remotes:
+            remote.send(("render", None))
+        return [remote.recv() for remote in self.remotes]
+
+    def get_attr(self, attr_name: str, indices: VecEnvIndices = None) -> List[Any]:
+        target_remotes = self._get_target_remotes(indices)
+        for remote in target_remotes:
+            remote.send(("get_attr", attr_name))
+        return [remote.recv() for remote in target_remotes]
+
+    def set_attr(
+        self, attr_name: str, value: Any, indices: VecEnvIndices = None
+    ) -> None:
+        target_remotes = self._get_target_remotes(indices)
+        for remote in target_remotes:
+            remote.send(("set_attr", (attr_name, value)))
+        for remote in target_remotes:
+            remote.recv()
+
+    def env_method(
+        self,
+        method_name: str,
+        *method_args,
+        indices: VecEnvIndices = None,
+        **method_kwargs,
+    ) -> List[Any]:
+        target_remotes = self._get_target_remotes(indices)
+        for remote in target_remotes:
+            remote.send(("env_method", (method_name, method_args, method_kwargs)))
+        return [remote.recv() for remote in target_remotes]
+
+    def env_is_wrapped(
+        self, wrapper_class: Type[gym.Wrapper], indices: VecEnvIndices = None
+    ) -> List[bool]:
+        target_remotes = self._get_target_remotes(indices)
+        for remote in target_remotes:
+            remote.send(("is_wrapped", wrapper_class))
+        return [remote.recv() for remote in target_remotes]
+
+    def _get_target_remotes(self, indices: VecEnvIndices) -> List[Any]:
+        return [self.remotes[i] for i in self._get_indices(indices)]
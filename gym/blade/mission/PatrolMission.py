@@ -1,6 +1,7 @@
 import json
-from typing import List
+from typing import List, Optional
 from random import random
+import numpy as np
 from shapely.geometry import Point, Polygon
 from blade.units.ReferencePoint import ReferencePoint
 
@@ -39,12 +40,14 @@ class PatrolMission:
             return True
         return False
 
-    def generate_random_coordinates_within_patrol_area(self) -> List[float]:
+    def generate_random_coordinates_within_patrol_area(
+        self, rng: Optional[np.random.Generator] = None
+    ) -> List[float]:
+        draw = random if rng is None else rng.random
         random_coordinates = [
-            random() * (self.assigned_area[2].latitude - self.assigned_area[0].latitude)
+            draw() * (self.assigned_area[2].latitude - self.assigned_area[0].latitude)
             + self.assigned_area[0].latitude,
-            random()
-            * (self.assigned_area[1].longitude - self.assigned_area[0].longitude)
+            draw() * (self.assigned_area[1].longitude - self.assigned_area[0].longitude)
             + self.assigned_area[0].longitude,
         ]
         return random_coordinates
@@ -2,9 +2,21 @@ import json
 from typing import List, Optional
 from blade.units.Aircraft import Aircraft
 from blade.utils.colors import convert_color_name_to_side_color, SIDE_COLOR
+from blade.units.SlottedUnit import SlottedUnit
 
 
-class Airbase:
+class Airbase(SlottedUnit):
+    __slots__ = (
+        "id",
+        "name",
+        "side_id",
+        "class_name",
+        "latitude",
+        "longitude",
+        "altitude",
+        "side_color",
+        "aircraft",
+    )
 
     def __init__(
         self,
@@ -2,9 +2,12 @@ import json
 from typing import List, Optional
 from blade.units.Weapon import Weapon
 from blade.utils.colors import convert_color_name_to_side_color, SIDE_COLOR
+from blade.units.ArmedUnit import ArmedUnit
 
 
 class BlackBox:
+    __slots__ = ("_logs",)
+
     def __init__(self):
         self._logs = []
 
@@ -75,7 +78,31 @@ class BlackBox:
         return [log for log in self._logs if log[key] == value]
 
 
-class Aircraft:
+class Aircraft(ArmedUnit):
+    __slots__ = (
+        "id",
+        "name",
+        "side_id",
+        "class_name",
+        "latitude",
+        "longitude",
+        "altitude",
+        "heading",
+        "speed",
+        "current_fuel",
+        "max_fuel",
+        "fuel_rate",
+        "range",
+        "route",
+        "selected",
+        "side_color",
+        "_weapons",
+        "home_base_id",
+        "rtb",
+        "target_id",
+        "_black_box",
+        "desired_route",
+    )
 
     def __init__(
         self,
@@ -121,17 +148,19 @@ class Aircraft:
         self.home_base_id = home_base_id if home_base_id is not None else ""
         self.rtb = rtb
         self.target_id = target_id if target_id is not None else ""
-        self.black_box = BlackBox()
+        self._black_box: Optional[BlackBox] = None
         self.desired_route = desired_route if desired_route is not None else []
 
+    @property
+    def black_box(self) -> BlackBox:
+        # most aircraft never log anything, so the black box is created on first use
+        if self._black_box is None:
+            self._black_box = BlackBox()
+        return self._black_box
+
     def get_total_weapon_quantity(self) -> int:
         return sum([weapon.current_quantity for weapon in self.weapons])
 
-    def get_weapon_with_highest_engagement_range(self) -> Weapon | None:
-        if len(self.weapons) == 0:
-            return None
-        return max(self.weapons, key=lambda weapon: weapon.get_engagement_range())
-
     def get_detection_range(self) -> float:
         return self.range
 
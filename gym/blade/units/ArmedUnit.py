@@ -0,0 +1,107 @@
+from typing import Any, Iterable, Optional
+
+from blade.units.SlottedUnit import SlottedUnit
+from blade.units.Weapon import Weapon
+
+
+class WeaponInventory(list):
+    """
+    The weapons a unit carries. The one with the highest engagement range is
+    cached until the list changes.
+    """
+
+    __slots__ = ("_best_weapon",)
+
+    def __init__(self, weapons: Iterable[Weapon] = ()):
+        super().__init__(weapons)
+        self._best_weapon: Optional[Weapon] = None
+
+    def __reduce__(self):
+        return (self.__class__, (list(self),))
+
+    def get_best_weapon(self) -> Weapon | None:
+        if self._best_weapon is None and len(self) > 0:
+            self._best_weapon = max(
+                self, key=lambda weapon: weapon.get_engagement_range()
+            )
+        return self._best_weapon
+
+    def clear_cache(self) -> None:
+        self._best_weapon = None
+
+    def append(self, weapon: Weapon) -> None:
+        super().append(weapon)
+        self._best_weapon = None
+
+    def extend(self, weapons: Iterable[Weapon]) -> None:
+        super().extend(weapons)
+        self._best_weapon = None
+
+    def __iadd__(self, weapons: Iterable[Weapon]):
+        self.extend(weapons)
+        return self
+
+    def insert(self, index: int, weapon: Weapon) -> None:
+        super().insert(index, weapon)
+        self._best_weapon = None
+
+    def remove(self, weapon: Weapon) -> None:
+        super().remove(weapon)
+        self._best_weapon = None
+
+    def pop(self, index: int = -1) -> Weapon:
+        self._best_weapon = None
+        return super().pop(index)
+
+    def clear(self) -> None:
+        super().clear()
+        self._best_weapon = None
+
+    def __setitem__(self, index, value) -> None:
+        super().__setitem__(index, value)
+        self._best_weapon = None
+
+    def __delitem__(self, index) -> None:
+        super().__delitem__(index)
+        self._best_weapon = None
+
+    def __imul__(self, count: int):
+        super().__imul__(count)
+        self._best_weapon = None
+        return self
+
+    # the first of equally ranged weapons wins, so the order matters too
+    def sort(self, *args: Any, **kwargs: Any) -> None:
+        super().sort(*args, **kwargs)
+        self._best_weapon = None
+
+    def reverse(self) -> None:
+        super().reverse()
+        self._best_weapon = None
+
+
+class ArmedUnit(SlottedUnit):
+    """
+    Base for the units that carry weapons. Subclasses keep them in a _weapons
+    slot; assigning a plain list to weapons wraps it in a WeaponInventory.
+    """
+
+    __slots__ = ()
+
+    @property
+    def weapons(self) -> WeaponInventory:
+        return self._weapons
+
+    @weapons.setter
+    def weapons(self, weapons: Iterable[Weapon]) -> None:
+        self._weapons = (
+            weapons if type(weapons) is WeaponInventory else WeaponInventory(weapons)
+        )
+
+    def get_weapon_with_highest_engagement_range(self) -> Weapon | None:
+        return self._weapons.get_best_weapon()
+
+    def clear_weapon_cache(self) -> None:
+        # the inventory only sees its own changes, call this after changing the
+        # fuel of a carried weapon
+        self._weapons.clear_cache()
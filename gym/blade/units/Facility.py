@@ -2,9 +2,23 @@ import json
 from typing import List, Optional
 from blade.units.Weapon import Weapon
 from blade.utils.colors import convert_color_name_to_side_color, SIDE_COLOR
+from blade.units.ArmedUnit import ArmedUnit
 
 
-class Facility:
+class Facility(ArmedUnit):
+    __slots__ = (
+        "id",
+        "name",
+        "side_id",
+        "class_name",
+        "latitude",
+        "longitude",
+        "altitude",
+        "range",
+        "side_color",
+        "_weapons",
+    )
+
     def __init__(
         self,
         id: str,
@@ -32,11 +46,6 @@ class Facility:
     def get_total_weapon_quantity(self) -> int:
         return sum([weapon.current_quantity for weapon in self.weapons])
 
-    def get_weapon_with_highest_engagement_range(self) -> Weapon | None:
-        if len(self.weapons) == 0:
-            return None
-        return max(self.weapons, key=lambda weapon: weapon.get_engagement_range())
-
     def get_detection_range(self) -> float:
         return self.range
 
@@ -1,9 +1,20 @@
 import json
 from typing import Optional
 from blade.utils.colors import convert_color_name_to_side_color, SIDE_COLOR
+from blade.units.SlottedUnit import SlottedUnit
 
 
-class ReferencePoint:
+class ReferencePoint(SlottedUnit):
+    __slots__ = (
+        "id",
+        "name",
+        "side_id",
+        "latitude",
+        "longitude",
+        "altitude",
+        "side_color",
+    )
+
     def __init__(
         self,
         id: str,
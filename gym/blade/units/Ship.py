@@ -3,9 +3,31 @@ from typing import List, Optional
 from blade.units.Aircraft import Aircraft
 from blade.units.Weapon import Weapon
 from blade.utils.colors import convert_color_name_to_side_color, SIDE_COLOR
+from blade.units.ArmedUnit import ArmedUnit
 
 
-class Ship:
+class Ship(ArmedUnit):
+    __slots__ = (
+        "id",
+        "name",
+        "side_id",
+        "class_name",
+        "latitude",
+        "longitude",
+        "altitude",
+        "heading",
+        "speed",
+        "current_fuel",
+        "max_fuel",
+        "fuel_rate",
+        "range",
+        "route",
+        "selected",
+        "side_color",
+        "_weapons",
+        "aircraft",
+        "desired_route",
+    )
 
     def __init__(
         self,
@@ -54,11 +76,6 @@ class Ship:
     def get_total_weapon_quantity(self) -> int:
         return sum([weapon.current_quantity for weapon in self.weapons])
 
-    def get_weapon_with_highest_engagement_range(self) -> Weapon | None:
-        if len(self.weapons) == 0:
-            return None
-        return max(self.weapons, key=lambda weapon: weapon.get_engagement_range())
-
     def get_detection_range(self) -> float:
         return self.range
 
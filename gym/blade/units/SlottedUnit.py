@@ -0,0 +1,30 @@
+from operator import attrgetter
+from typing import Any, Dict, Tuple
+
+_slot_getters: Dict[type, attrgetter] = {}
+
+
+def _restore_unit(unit_class: type, values: Tuple[Any, ...]) -> Any:
+    unit = unit_class.__new__(unit_class)
+    for name, value in zip(unit_class.__slots__, values):
+        setattr(unit, name, value)
+    return unit
+
+
+class SlottedUnit:
+    """
+    Base for the unit classes, which list their attributes in __slots__ instead of
+    keeping a per-instance __dict__.
+
+    Units pickle (for Scenario.snapshot) as their class and a tuple of slot values,
+    which is smaller and faster to restore than the default per-slot state dict.
+    """
+
+    __slots__ = ()
+
+    def __reduce__(self):
+        unit_class = type(self)
+        getter = _slot_getters.get(unit_class)
+        if getter is None:
+            getter = _slot_getters[unit_class] = attrgetter(*unit_class.__slots__)
+        return (_restore_unit, (unit_class, getter(self)))
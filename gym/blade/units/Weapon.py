@@ -1,9 +1,33 @@
 import json
 from typing import List, Optional
 from blade.utils.colors import convert_color_name_to_side_color, SIDE_COLOR
+from blade.units.SlottedUnit import SlottedUnit
+from blade.utils.utils import format_unit_id
 
 
-class Weapon:
+class Weapon(SlottedUnit):
+    __slots__ = (
+        "id",
+        "name",
+        "side_id",
+        "class_name",
+        "latitude",
+        "longitude",
+        "altitude",
+        "heading",
+        "speed",
+        "current_fuel",
+        "max_fuel",
+        "fuel_rate",
+        "range",
+        "target_id",
+        "lethality",
+        "max_quantity",
+        "current_quantity",
+        "route",
+        "side_color",
+    )
+
     def __init__(
         self,
         id: str,
@@ -53,7 +77,7 @@ class Weapon:
 
     def to_dict(self):
         return {
-            "id": str(self.id),
+            "id": format_unit_id(self.id),
             "name": self.name,
             "side_id": str(self.side_id),
             "class_name": self.class_name,
@@ -66,7 +90,7 @@ class Weapon:
             "max_fuel": self.max_fuel,
             "fuel_rate": self.fuel_rate,
             "range": self.range,
-            "target_id": str(self.target_id),
+            "target_id": format_unit_id(self.target_id),
             "lethality": self.lethality,
             "max_quantity": self.max_quantity,
             "current_quantity": self.current_quantity,
@@ -0,0 +1,210 @@
+import gzip
+import json
+from typing import Any, List, Optional, Tuple
+
+DEFAULT_KEYFRAME_INTERVAL = 100
+KEYFRAME = "k"
+DELTA = "d"
+
+
+def _is_unit_list(value: Any) -> bool:
+    if type(value) is not list or len(value) == 0:
+        return False
+    ids = set()
+    for item in value:
+        if type(item) is not dict or "id" not in item or item["id"] in ids:
+            return False
+        ids.add(item["id"])
+    return True
+
+
+def _diff(previous: Any, current: Any) -> Optional[dict]:
+    if type(previous) is dict and type(current) is dict:
+        return _diff_dict(previous, current)
+    return _diff_unit_list(previous, current)
+
+
+def _diff_dict(previous: dict, current: dict) -> Optional[dict]:
+    set_values = {}
+    changes = {}
+    for key, value in current.items():
+        if key not in previous:
+            set_values[key] = value
+            continue
+        old_value = previous[key]
+        if (type(old_value) is dict and type(value) is dict) or (
+            _is_unit_list(old_value) and _is_unit_list(value)
+        ):
+            change = _diff(old_value, value)
+            if change is not None:
+                changes[key] = change
+        elif type(old_value) is not type(value) or old_value != value:
+            set_values[key] = value
+    removed = [key for key in previous if key not in current]
+    return _make_delta(set_values, removed, changes)
+
+
+def _diff_unit_list(previous: list, current: list) -> Optional[dict]:
+    previous_by_id = {unit["id"]: unit for unit in previous}
+    current_ids = [unit["id"] for unit in current]
+    set_values = {}
+    changes = {}
+    for unit in current:
+        old_unit = previous_by_id.get(unit["id"])
+        if old_unit is None:
+            set_values[unit["id"]] = unit
+            continue
+        change = _diff_dict(old_unit, unit)
+        if change is not None:
+            changes[unit["id"]] = change
+    current_id_set = set(current_ids)
+    removed = [unit_id for unit_id in previous_by_id if unit_id not in current_id_set]
+    delta = _make_delta(set_values, removed, changes) or {}
+    kept_order = [unit_id for unit_id in previous_by_id if unit_id in current_id_set]
+    if kept_order + list(set_values) != current_ids:
+        delta["o"] = current_ids
+    return delta if len(delta) > 0 else None
+
+
+def _make_delta(set_values: dict, removed: list, changes: dict) -> Optional[dict]:
+    delta = {}
+    if len(set_values) > 0:
+        delta["s"] = set_values
+    if len(removed) > 0:
+        delta["r"] = removed
+    if len(changes) > 0:
+        delta["c"] = changes
+    return delta if len(delta) > 0 else None
+
+
+def diff_scenario(previous: dict, current: dict) -> Optional[dict]:
+    """
+    Changes between two exported scenarios (Game.export_scenario), or None if
+    they are equal. Lists of objects with unique ids are diffed by id, any other
+    changed value is stored whole.
+    """
+    return _diff_dict(previous, current)
+
+
+def apply_scenario_delta(base: Any, delta: dict) -> Any:
+    """Returns a new value with the delta applied, base is not modified."""
+    if type(base) is list:
+        units_by_id = {unit["id"]: unit for unit in base}
+        for unit_id in delta.get("r", ()):
+            del units_by_id[unit_id]
+        for unit_id, change in delta.get("c", {}).items():
+            units_by_id[unit_id] = apply_scenario_delta(units_by_id[unit_id], change)
+        order = delta.get("o")
+        if order is None:
+            order = list(units_by_id) + [
+                unit_id for unit_id in delta.get("s", {}) if unit_id not in units_by_id
+            ]
+        units_by_id.update(delta.get("s", {}))
+        return [units_by_id[unit_id] for unit_id in order]
+
+    result = dict(base)
+    for key in delta.get("r", ()):
+        del result[key]
+    for key, change in delta.get("c", {}).items():
+        result[key] = apply_scenario_delta(result[key], change)
+    result.update(delta.get("s", {}))
+    return result
+
+
+class DeltaRecordingWriter:
+    """
+    Writes exported scenarios as a keyframe followed by per-step deltas.
+
+    Every line is "<scenario time>\\t<k|d>\\t<json>". Each keyframe starts a new
+    gzip member, so the file is a regular gzip stream and a reader can start
+    decompressing at any keyframe.
+    """
+
+    def __init__(
+        self, file_path: str, keyframe_interval: int = DEFAULT_KEYFRAME_INTERVAL
+    ):
+        self.file_path = file_path
+        self.keyframe_interval = max(1, keyframe_interval)
+        self.file = open(file_path, "wb")
+        self.stream: Optional[gzip.GzipFile] = None
+        self.previous_frame: Optional[dict] = None
+        self.frames_since_keyframe = 0
+        # (scenario time, byte offset) of every keyframe
+        self.index: List[Tuple[int, int]] = []
+
+    def write(self, scenario_time: int, frame: dict) -> None:
+        if (
+            self.previous_frame is None
+            or self.frames_since_keyframe >= self.keyframe_interval
+        ):
+            self._start_keyframe(scenario_time)
+            line = f"{scenario_time}\t{KEYFRAME}\t{json.dumps(frame)}\n"
+        else:
+            delta = diff_scenario(self.previous_frame, frame)
+            line = f"{scenario_time}\t{DELTA}\t{json.dumps(delta)}\n"
+        self.stream.write(line.encode("utf-8"))
+        self.previous_frame = frame
+        self.frames_since_keyframe += 1
+
+    def _start_keyframe(self, scenario_time: int) -> None:
+        if self.stream is not None:
+            self.stream.close()
+        self.index.append((scenario_time, self.file.tell()))
+        self.stream = gzip.GzipFile(fileobj=self.file, mode="wb", mtime=0)
+        self.frames_since_keyframe = 0
+
+    @property
+    def size(self) -> int:
+        return self.file.tell()
+
+    def close(self) -> None:
+        if self.stream is not None:
+            self.stream.close()
+            self.stream = None
+        self.file.close()
+
+
+class DeltaRecordingReader:
+    """Reconstructs the exported scenario at any recorded time of a delta recording."""
+
+    def __init__(self, file_path: str):
+        self.file_path = file_path
+        self.times: List[int] = []
+        self._kinds: List[str] = []
+        self._payloads: List[bytes] = []
+        with gzip.open(file_path, "rb") as recording_file:
+            for line in recording_file:
+                scenario_time, kind, payload = line.split(b"\t", 2)
+                self.times.append(int(scenario_time))
+                self._kinds.append(kind.decode())
+                self._payloads.append(payload)
+
+    def __len__(self) -> int:
+        return len(self.times)
+
+    def get_frame_index(self, scenario_time: int) -> int:
+        """Index of the last frame recorded at or before scenario_time."""
+        low, high = 0, len(self.times)
+        while low < high:
+            middle = (low + high) // 2
+            if self.times[middle] <= scenario_time:
+                low = middle + 1
+            else:
+                high = middle
+        if low == 0:
+            raise IndexError(f"No frame recorded at or before {scenario_time}")
+        return low - 1
+
+    def get_frame(self, frame_index: int) -> dict:
+        keyframe_index = frame_index
+        while self._kinds[keyframe_index] != KEYFRAME:
+            keyframe_index -= 1
+        frame = json.loads(self._payloads[keyframe_index])
+        for index in range(keyframe_index + 1, frame_index + 1):
+            delta = json.loads(self._payloads[index])
+            if delta is not None:
+                frame = apply_scenario_delta(frame, delta)
+        return frame
+
+    def get_scenario_export(self, scenario_time: int) -> dict:
+        return self.get_frame(self.get_frame_index(scenario_time))
@@ -0,0 +1,313 @@
+import json
+import math
+from multiprocessing import Pool
+from typing import Dict, Iterator, Optional
+
+import numpy as np
+
+from blade.Game import Game, TICK_EVENTS
+from blade.Scenario import Scenario
+from blade.mission.StrikeMission import StrikeMission
+
+# unit types counted per side, aircraft parked at airbases or on ships included
+UNIT_TYPES = ("aircraft", "ships", "facilities", "airbases")
+
+
+def count_side_units(scenario: Scenario) -> Dict[str, Dict[str, int]]:
+    """side id -> unit type -> number of units."""
+    counts = {side.id: dict.fromkeys(UNIT_TYPES, 0) for side in scenario.sides}
+
+    def count(unit_type: str, units: list) -> None:
+        for unit in units:
+            side_counts = counts.get(unit.side_id)
+            if side_counts is None:
+                side_counts = counts[unit.side_id] = dict.fromkeys(UNIT_TYPES, 0)
+            side_counts[unit_type] += 1
+
+    for unit_type in UNIT_TYPES:
+        count(unit_type, getattr(scenario, unit_type))
+    for host in (*scenario.ships, *scenario.airbases):
+        count("aircraft", host.aircraft)
+    return counts
+
+
+def count_platforms(scenario: Scenario) -> int:
+    count = 0
+    for unit_type in UNIT_TYPES:
+        count += len(getattr(scenario, unit_type))
+    for host in (*scenario.ships, *scenario.airbases):
+        count += len(host.aircraft)
+    return count
+
+
+class RunningStatistic:
+    """Count, mean, standard deviation and range of a stream of values."""
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self._squared_deviations = 0.0
+        self.minimum = math.inf
+        self.maximum = -math.inf
+
+    def add(self, value: float) -> None:
+        # Welford's update, so the values never need to be kept
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self._squared_deviations += delta * (value - self.mean)
+        self.minimum = min(self.minimum, value)
+        self.maximum = max(self.maximum, value)
+
+    def summary(self) -> dict:
+        if self.count == 0:
+            return {"count": 0}
+        return {
+            "count": self.count,
+            "mean": self.mean,
+            "std": (
+                math.sqrt(self._squared_deviations / (self.count - 1))
+                if self.count > 1
+                else 0.0
+            ),
+            "min": self.minimum,
+            "max": self.maximum,
+        }
+
+
+class OutcomeStatistics:
+    """Aggregates replica results as they arrive, without keeping them."""
+
+    def __init__(self):
+        self.replicas = 0
+        self.stopped = 0
+        self.units_lost: Dict[str, Dict[str, RunningStatistic]] = {}
+        self.weapons_expended: Dict[str, RunningStatistic] = {}
+        self.time_to_first_kill = RunningStatistic()
+        self.missions_completed: Dict[str, int] = {}
+        self.events = {event: RunningStatistic() for event in TICK_EVENTS}
+        self.seconds = RunningStatistic()
+
+    def add(self, result: dict) -> None:
+        self.replicas += 1
+        self.stopped += result["stopped"]
+        for side_id, losses in result["units_lost"].items():
+            side_statistics = self.units_lost.setdefault(side_id, {})
+            for unit_type, lost in losses.items():
+                side_statistics.setdefault(unit_type, RunningStatistic()).add(lost)
+        for side_id, expended in result["weapons_expended"].items():
+            self.weapons_expended.setdefault(side_id, RunningStatistic()).add(expended)
+        if result["time_to_first_kill"] is not None:
+            self.time_to_first_kill.add(result["time_to_first_kill"])
+        for mission_id, completed in result["missions_completed"].items():
+            self.missions_completed[mission_id] = (
+                self.missions_completed.get(mission_id, 0) + completed
+            )
+        for event, count in result["events"].items():
+            self.events[event].add(count)
+        self.seconds.add(result["seconds"])
+
+    def summary(self) -> dict:
+        return {
+            "replicas": self.replicas,
+            "stopped": self.stopped,
+            "seconds": self.seconds.summary(),
+            "units_lost": {
+                side_id: {
+                    unit_type: statistic.summary()
+                    for unit_type, statistic in side_statistics.items()
+                }
+                for side_id, side_statistics in self.units_lost.items()
+            },
+            "weapons_expended": {
+                side_id: statistic.summary()
+                for side_id, statistic in self.weapons_expended.items()
+            },
+            "time_to_first_kill": {
+                **self.time_to_first_kill.summary(),
+                "kill_rate": (
+                    self.time_to_first_kill.count / self.replicas
+                    if self.replicas
+                    else 0.0
+                ),
+            },
+            "mission_completion_rate": {
+                mission_id: completed / self.replicas
+                for mission_id, completed in self.missions_completed.items()
+            },
+            "events": {
+                event: statistic.summary() for event, statistic in self.events.items()
+            },
+        }
+
+
+class MonteCarloRunner:
+    """
+    Plays many replicas of a saved scenario and collects their outcomes.
+
+    Replica i is seeded with SeedSequence(seed, spawn_key=(i,)), the i-th child of
+    SeedSequence(seed).spawn, so every replica draws from its own stream and can
+    be replayed alone with run_replica(i). A replica runs for max_ticks updates,
+    or until max_seconds of scenario time have passed, until the game ends or
+    until the first tick with the until event (one of TICK_EVENTS).
+    """
+
+    def __init__(
+        self,
+        scenario_string: str,
+        max_ticks: int,
+        until: Optional[str] = None,
+        max_seconds: Optional[int] = None,
+        max_time_step: int = 1,
+        seed: int = 0,
+    ):
+        if until is not None and until not in TICK_EVENTS:
+            raise ValueError(f"Unknown event: {until}, expected one of {TICK_EVENTS}")
+        self.scenario_string = scenario_string
+        self.max_ticks = max_ticks
+        self.until = until
+        self.max_seconds = max_seconds
+        self.max_time_step = max_time_step
+        self.seed = seed
+        self._game: Optional[Game] = None
+
+    def __getstate__(self) -> dict:
+        # each worker process loads its own game
+        return {**self.__dict__, "_game": None}
+
+    @property
+    def game(self) -> Game:
+        if self._game is None:
+            self._game = Game(
+                current_scenario=Scenario(), max_time_step=self.max_time_step
+            )
+            self._game.load_scenario(self.scenario_string)
+        return self._game
+
+    def run_replica(self, replica: int) -> dict:
+        game = self.game
+        game.reset(seed=np.random.SeedSequence(self.seed, spawn_key=(replica,)))
+        scenario = game.current_scenario
+        start_time = scenario.current_time
+        initial_units = count_side_units(scenario)
+        initial_launches = dict(scenario.weapons.launches_by_side)
+        strike_missions = [
+            mission
+            for mission in scenario.missions
+            if isinstance(mission, StrikeMission)
+        ]
+        platforms = count_platforms(scenario)
+        time_to_first_kill = None
+        until_event = False
+
+        def check_first_kill(tick_events: dict) -> None:
+            nonlocal platforms, time_to_first_kill
+            # weapons shot down count as destroyed units too, so look for a
+            # platform that is gone
+            remaining_platforms = count_platforms(scenario)
+            if (
+                time_to_first_kill is None
+                and tick_events["units_destroyed"] > 0
+                and remaining_platforms < platforms
+            ):
+                time_to_first_kill = scenario.current_time - start_time
+            platforms = remaining_platforms
+
+        def replica_over(tick_events: dict) -> bool:
+            nonlocal until_event
+            check_first_kill(tick_events)
+            if self.until is not None and tick_events[self.until] > 0:
+                until_event = True
+                return True
+            return (
+                self.max_seconds is not None
+                and scenario.current_time - start_time >= self.max_seconds
+            )
+
+        outcome = game.advance(self.max_ticks, until=replica_over)
+        # advance stops on the end of the game before asking until
+        if outcome["game_ended"]:
+            check_first_kill(game.tick_events)
+
+        final_units = count_side_units(scenario)
+        launches = scenario.weapons.launches_by_side
+        return {
+            "replica": replica,
+            "ticks": outcome["ticks"],
+            "seconds": outcome["current_time"] - start_time,
+            "stopped": until_event,
+            "game_ended": outcome["game_ended"],
+            "units_lost": {
+                side_id: {
+                    unit_type: count - final_units.get(side_id, {}).get(unit_type, 0)
+                    for unit_type, count in side_units.items()
+                }
+                for side_id, side_units in initial_units.items()
+            },
+            "weapons_expended": {
+                side_id: launches.get(side_id, 0) - initial_launches.get(side_id, 0)
+                for side_id in initial_units
+            },
+            "time_to_first_kill": time_to_first_kill,
+            "missions_completed": {
+                mission.id: all(
+                    scenario.get_target(target_id) is None
+                    for target_id in mission.assigned_target_ids
+                )
+                for mission in strike_missions
+            },
+            "events": {event: outcome[event] for event in TICK_EVENTS},
+        }
+
+    def iter_results(
+        self, replicas: int, processes: Optional[int] = None, chunksize: int = 1
+    ) -> Iterator[dict]:
+        """
+        Replica results in the order they finish, from a pool of processes (one
+        per core by default) or from this process when processes is 1.
+        """
+        if processes == 1:
+            for replica in range(replicas):
+                yield self.run_replica(replica)
+            return
+        with Pool(processes, initializer=_init_worker, initargs=(self,)) as pool:
+            yield from pool.imap_unordered(_run_replica, range(replicas), chunksize)
+
+    def run(
+        self,
+        replicas: int,
+        output_path: Optional[str] = None,
+        processes: Optional[int] = None,
+        chunksize: int = 1,
+    ) -> dict:
+        """
+        Runs the replicas and returns the summary of their outcomes. Each result
+        is appended to output_path as a JSON line as soon as it arrives.
+        """
+        statistics = OutcomeStatistics()
+        output_file = (
+            open(output_path, "w", encoding="utf-8", buffering=1)
+            if output_path
+            else None
+        )
+        try:
+            for result in self.iter_results(replicas, processes, chunksize):
+                statistics.add(result)
+                if output_file is not None:
+                    output_file.write(json.dumps(result) + "\n")
+        finally:
+            if output_file is not None:
+                output_file.close()
+        return statistics.summary()
+
+
+_worker_runner: Optional[MonteCarloRunner] = None
+
+
+def _init_worker(runner: MonteCarloRunner) -> None:
+    global _worker_runner
+    _worker_runner = runner
+
+
+def _run_replica(replica: int) -> dict:
+    return _worker_runner.run_replica(replica)
@@ -0,0 +1,196 @@
+import os
+import re
+import json
+import gzip
+import zlib
+from bisect import bisect_right
+from typing import Iterator, List, Optional, Tuple
+
+from blade.Scenario import Scenario
+from blade.utils.DeltaRecording import KEYFRAME, apply_scenario_delta
+from blade.utils.ScenarioLoader import load_scenario_object
+
+RECORDING_FILE_PATTERN = re.compile(r".* Recording .*\.(jsonl|delta\.gz)$")
+CURRENT_TIME_PATTERN = re.compile(rb'"currentTime": (-?\d+)')
+INDEX_READ_CHUNK_SIZE = 1024 * 1024
+
+
+def _get_recording_format(file_path: str) -> str:
+    return "delta" if file_path.endswith(".delta.gz") else "jsonl"
+
+
+def _build_jsonl_index(file_path: str) -> List[Tuple[int, int]]:
+    index = []
+    offset = 0
+    with open(file_path, "rb") as recording_file:
+        for line in recording_file:
+            match = CURRENT_TIME_PATTERN.search(line)
+            if match is not None:
+                index.append((int(match.group(1)), offset))
+            offset += len(line)
+    return index
+
+
+def _build_delta_index(file_path: str) -> List[Tuple[int, int]]:
+    """
+    Keyframe times and offsets, found by streaming through the file and
+    decompressing one gzip member at a time. Only the time in front of each
+    member's first tab is kept.
+    """
+    index = []
+    offset = 0
+    data = b""
+    with open(file_path, "rb") as recording_file:
+        while True:
+            if not data:
+                data = recording_file.read(INDEX_READ_CHUNK_SIZE)
+                if not data:
+                    break
+            decompressor = zlib.decompressobj(wbits=31)
+            head = b""
+            member_size = 0
+            while True:
+                member_size += len(data)
+                output = decompressor.decompress(data)
+                if b"\t" not in head:
+                    head += output
+                if decompressor.eof:
+                    data = decompressor.unused_data
+                    member_size -= len(data)
+                    break
+                data = recording_file.read(INDEX_READ_CHUNK_SIZE)
+                if not data:
+                    break
+            index.append((int(head.split(b"\t", 1)[0]), offset))
+            offset += member_size
+    return index
+
+
+class PlaybackReader:
+    """
+    Random access over one or more recordings (JSONL or delta) written by the
+    PlaybackRecorder.
+
+    Each file's time index is loaded from its '<file>.index.json' when there is
+    one and built otherwise. Reading a time seeks straight to the closest frame
+    (JSONL) or keyframe (delta) instead of parsing everything before it.
+    """
+
+    def __init__(self, file_paths: str | List[str]):
+        if isinstance(file_paths, str):
+            if os.path.isdir(file_paths):
+                file_paths = [
+                    os.path.join(file_paths, file_name)
+                    for file_name in sorted(os.listdir(file_paths))
+                    if RECORDING_FILE_PATTERN.match(file_name)
+                ]
+            else:
+                file_paths = [file_paths]
+        self.file_paths = list(file_paths)
+        # (scenario time, file number, byte offset) of every seekable frame
+        self.entries: List[Tuple[int, int, int]] = []
+        for file_number, file_path in enumerate(self.file_paths):
+            for scenario_time, offset in self.load_index(file_path):
+                self.entries.append((scenario_time, file_number, offset))
+        self.entries.sort()
+        self.entry_times = [scenario_time for scenario_time, _, _ in self.entries]
+        self.file_order: List[int] = []
+        for _, file_number, _ in self.entries:
+            if file_number not in self.file_order:
+                self.file_order.append(file_number)
+
+    @staticmethod
+    def load_index(file_path: str) -> List[Tuple[int, int]]:
+        index_path = f"{file_path}.index.json"
+        if os.path.exists(index_path):
+            with open(index_path, "r", encoding="utf-8") as index_file:
+                index = json.load(index_file)
+            return list(zip(index["times"], index["offsets"]))
+        if _get_recording_format(file_path) == "delta":
+            return _build_delta_index(file_path)
+        return _build_jsonl_index(file_path)
+
+    def _get_entry(self, scenario_time: int) -> int:
+        entry = bisect_right(self.entry_times, scenario_time) - 1
+        if entry < 0:
+            raise IndexError(f"No frame recorded at or before {scenario_time}")
+        return entry
+
+    def _iter_file(self, file_number: int, offset: int) -> Iterator[Tuple[int, dict]]:
+        file_path = self.file_paths[file_number]
+        with open(file_path, "rb") as recording_file:
+            recording_file.seek(offset)
+            if _get_recording_format(file_path) == "jsonl":
+                for line in recording_file:
+                    if not line.strip():
+                        continue
+                    frame = json.loads(line)
+                    yield frame["currentScenario"]["currentTime"], frame
+                return
+            frame = None
+            with gzip.GzipFile(fileobj=recording_file, mode="rb") as stream:
+                for line in stream:
+                    scenario_time, kind, payload = line.split(b"\t", 2)
+                    if kind.decode() == KEYFRAME:
+                        frame = json.loads(payload)
+                    else:
+                        delta = json.loads(payload)
+                        if delta is not None:
+                            frame = apply_scenario_delta(frame, delta)
+                    yield int(scenario_time), frame
+
+    def iter_exports(
+        self, start_time: int, end_time: Optional[int] = None
+    ) -> Iterator[Tuple[int, dict]]:
+        """
+        Lazily yields (scenario time, exported scenario) for the last frame
+        recorded at or before start_time and every frame after it up to end_time.
+        Delta frames share unchanged parts with each other, treat them as read-only.
+        """
+        _, file_number, offset = self.entries[self._get_entry(start_time)]
+        previous = None
+        for file_number in self.file_order[self.file_order.index(file_number) :]:
+            for scenario_time, frame in self._iter_file(file_number, offset):
+                if scenario_time <= start_time:
+                    previous = (scenario_time, frame)
+                    continue
+                if previous is not None:
+                    yield previous
+                    previous = None
+                if end_time is not None and scenario_time > end_time:
+                    return
+                yield scenario_time, frame
+            offset = 0
+        if previous is not None:
+            yield previous
+
+    def get_scenario_export(self, scenario_time: int) -> dict:
+        """The exported scenario last recorded at or before scenario_time."""
+        for _, frame in self.iter_exports(scenario_time, scenario_time):
+            return frame
+
+    def get_scenario(self, scenario_time: int) -> Scenario:
+        return load_scenario_object(
+            self.get_scenario_export(scenario_time)["currentScenario"]
+        )
+
+    def iter_scenarios(
+        self, start_time: int, end_time: Optional[int] = None
+    ) -> Iterator[Tuple[int, Scenario]]:
+        """
+        Scenarios are built straight from the frames, so those from a delta
+        recording share routes and relationships with the frames after them;
+        deepcopy one before simulating it while iterating.
+        """
+        for scenario_time, frame in self.iter_exports(start_time, end_time):
+            yield scenario_time, load_scenario_object(frame["currentScenario"])
+
+    def iter_arrays(
+        self, encoder, start_time: int, end_time: Optional[int] = None
+    ) -> Iterator[Tuple[int, dict]]:
+        """Yields copies of each frame encoded by an ObservationEncoder."""
+        for scenario_time, scenario in self.iter_scenarios(start_time, end_time):
+            observation = encoder.encode(scenario)
+            yield scenario_time, {
+                key: value.copy() for key, value in observation.items()
+            }
@@ -1,10 +1,19 @@
+import os
+import json
 from typing import Optional
 from blade.Scenario import Scenario
 from blade.utils.utils import unix_to_local_time
+from blade.utils.DeltaRecording import DeltaRecordingWriter, DEFAULT_KEYFRAME_INTERVAL
+from blade.utils.RecordingWriter import (
+    BackgroundRecordingWriter,
+    JsonlRecordingWriter,
+)
 
 FILE_SIZE_LIMIT_MB = 10
 CHARACTER_LIMIT = FILE_SIZE_LIMIT_MB * 1024 * 1024
 RECORDING_INTERVAL_SECONDS = 10
+RECORDING_FORMATS = ("jsonl", "delta")
+RECORDING_FILE_EXTENSIONS = {"jsonl": ".jsonl", "delta": ".delta.gz"}
 
 
 class PlaybackRecorder:
@@ -13,7 +22,16 @@ class PlaybackRecorder:
         self,
         record_every_seconds: Optional[int] = None,
         recording_export_path: Optional[str] = ".",
+        recording_format: str = "jsonl",
+        keyframe_interval: int = DEFAULT_KEYFRAME_INTERVAL,
+        streaming: bool = False,
+        background_writer: bool = False,
+        rotate_every_seconds: Optional[int] = None,
     ) -> None:
+        if recording_format not in RECORDING_FORMATS:
+            raise ValueError(
+                f"Unknown recording format: {recording_format}, expected one of {RECORDING_FORMATS}"
+            )
         self.scenario_name: str = "New Scenario"
         self.current_scenario_time: int = 0
         self.recording: str = ""
@@ -22,6 +40,15 @@ class PlaybackRecorder:
             record_every_seconds if record_every_seconds else RECORDING_INTERVAL_SECONDS
         )
         self.recording_export_path: str = recording_export_path
+        self.recording_format: str = recording_format
+        self.keyframe_interval: int = keyframe_interval
+        # delta recordings are always written as they are recorded
+        self.streaming: bool = streaming or recording_format == "delta"
+        self.background_writer: bool = background_writer
+        self.rotate_every_seconds: Optional[int] = rotate_every_seconds
+        self.writer: Optional[
+            JsonlRecordingWriter | DeltaRecordingWriter | BackgroundRecordingWriter
+        ] = None
 
     def should_record(self, current_scenario_time: int) -> bool:
         if (
@@ -33,6 +60,8 @@ class PlaybackRecorder:
         return False
 
     def reset(self):
+        if self.writer is not None:
+            self.export_recording(self.current_scenario_time)
         self.scenario_name = "New Scenario"
         self.recording = ""
         self.current_scenario_time = 0
@@ -44,33 +73,93 @@ class PlaybackRecorder:
         self.current_scenario_time = scenario.current_time
         self.recording_start_time = scenario.current_time
 
-    def record_step(self, current_step: str, current_scenario_time: int):
+    def record_step(self, current_step: str | bytes | dict, current_scenario_time: int):
+        if self.streaming:
+            self.write_step(current_step, current_scenario_time)
+            return
+        if isinstance(current_step, bytes):
+            current_step = current_step.decode("utf-8")
         self.recording += current_step + "\n"
         if len(self.recording) > CHARACTER_LIMIT:
             self.export_recording(current_scenario_time, self.recording_start_time)
             self.recording_start_time = current_scenario_time
             self.recording = ""
 
+    def should_rotate(self, current_scenario_time: int) -> bool:
+        return self.writer.size > CHARACTER_LIMIT or (
+            self.rotate_every_seconds is not None
+            and current_scenario_time - self.recording_start_time
+            >= self.rotate_every_seconds
+        )
+
+    def open_writer(self):
+        formatted_recording_start_time = unix_to_local_time(
+            self.recording_start_time, separator=""
+        )
+        file_path = f"{self.recording_export_path}/{self.scenario_name} Recording {formatted_recording_start_time}{RECORDING_FILE_EXTENSIONS[self.recording_format]}.part"
+        if self.recording_format == "delta":
+            self.writer = DeltaRecordingWriter(file_path, self.keyframe_interval)
+        else:
+            self.writer = JsonlRecordingWriter(file_path)
+        if self.background_writer:
+            self.writer = BackgroundRecordingWriter(self.writer)
+
+    def write_step(self, current_step: str | bytes | dict, current_scenario_time: int):
+        if self.writer is None:
+            self.open_writer()
+        self.writer.write(current_scenario_time, current_step)
+        if self.should_rotate(current_scenario_time):
+            self.export_recording(current_scenario_time)
+            self.recording_start_time = current_scenario_time
+
+    def get_export_file_path(
+        self, recording_start_time_unix: int, recording_end_time_unix: int
+    ) -> str:
+        formatted_recording_start_time = unix_to_local_time(
+            recording_start_time_unix, separator=""
+        )
+        formatted_recording_end_time = unix_to_local_time(
+            recording_end_time_unix, separator=""
+        )
+        suffix = f"{formatted_recording_start_time} - {formatted_recording_end_time}"
+        return f"{self.recording_export_path}/{self.scenario_name} Recording {suffix}{RECORDING_FILE_EXTENSIONS[self.recording_format]}"
+
+    def export_writer(self, recording_end_time_unix: int):
+        writer = self.writer
+        self.writer = None
+        writer.close()
+        filename = self.get_export_file_path(
+            self.recording_start_time, recording_end_time_unix
+        )
+        os.replace(writer.file_path, filename)
+        with open(f"{filename}.index.json", "w", encoding="utf-8") as index_file:
+            json.dump(
+                {
+                    "format": self.recording_format,
+                    "times": [scenario_time for scenario_time, _ in writer.index],
+                    "offsets": [offset for _, offset in writer.index],
+                },
+                index_file,
+            )
+        print(f"Recording exported to '{filename}'")
+
     def export_recording(
         self,
         recording_end_time_unix: int,
         recording_start_time_unix: Optional[int] = None,
     ):
+        if self.writer is not None:
+            self.export_writer(recording_end_time_unix)
+            return
         if not self.recording:
             return
 
         if recording_start_time_unix is None:
             recording_start_time_unix = self.recording_start_time
 
-        formatted_recording_start_time = unix_to_local_time(
-            recording_start_time_unix, separator=""
-        )
-        formatted_recording_end_time = unix_to_local_time(
-            recording_end_time_unix, separator=""
+        filename = self.get_export_file_path(
+            recording_start_time_unix, recording_end_time_unix
         )
-        suffix = f"{formatted_recording_start_time} - {formatted_recording_end_time}"
-
-        filename = f"{self.recording_export_path}/{self.scenario_name} Recording {suffix}.jsonl"
 
         with open(filename, "w", encoding="utf-8") as file:
             file.write(self.recording.rstrip("\n"))
@@ -0,0 +1,84 @@
+import queue
+import threading
+from typing import List, Optional, Tuple
+
+BACKGROUND_WRITER_QUEUE_SIZE = 256
+
+
+class JsonlRecordingWriter:
+    """Appends recorded steps to a JSONL file, one exported scenario per line."""
+
+    def __init__(self, file_path: str):
+        self.file_path = file_path
+        self.file = open(file_path, "wb")
+        self.size = 0
+        self.index: List[Tuple[int, int]] = []
+
+    def write(self, scenario_time: int, frame: str | bytes) -> None:
+        if isinstance(frame, str):
+            frame = frame.encode("utf-8")
+        line = frame + b"\n"
+        self.index.append((scenario_time, self.size))
+        self.file.write(line)
+        self.size += len(line)
+
+    def close(self) -> None:
+        if self.size > 0:
+            # match the in-memory recording, which has no trailing newline
+            self.file.truncate(self.size - 1)
+        self.file.close()
+
+
+class BackgroundRecordingWriter:
+    """
+    Runs another recording writer on a thread so record_step never waits on disk.
+
+    An error raised by the writer is re-raised by the next write or by close.
+    After it the thread drops the queued steps, so the game never blocks on a
+    full queue.
+    """
+
+    def __init__(self, writer):
+        self.writer = writer
+        self.queue = queue.Queue(maxsize=BACKGROUND_WRITER_QUEUE_SIZE)
+        self.error: Optional[BaseException] = None
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+
+    def _run(self) -> None:
+        while True:
+            step = self.queue.get()
+            if step is None:
+                break
+            if self.error is not None:
+                continue
+            try:
+                self.writer.write(*step)
+            except BaseException as error:
+                self.error = error
+
+    @property
+    def file_path(self) -> str:
+        return self.writer.file_path
+
+    @property
+    def size(self) -> int:
+        return self.writer.size
+
+    @property
+    def index(self) -> List[Tuple[int, int]]:
+        return self.writer.index
+
+    def write(self, scenario_time: int, frame) -> None:
+        if self.error is not None:
+            raise self.error
+        self.queue.put((scenario_time, frame))
+
+    def close(self) -> None:
+        self.queue.put(None)
+        self.thread.join()
+        try:
+            self.writer.close()
+        finally:
+            if self.error is not None:
+                raise self.error
@@ -0,0 +1,215 @@
+import json
+from enum import Enum
+from operator import attrgetter
+from typing import Any, Callable, Dict, List, Tuple
+
+from blade.units.Aircraft import Aircraft
+from blade.units.Ship import Ship
+from blade.units.Facility import Facility
+from blade.units.Airbase import Airbase
+from blade.units.Weapon import Weapon
+from blade.units.ReferencePoint import ReferencePoint
+from blade.Side import Side
+from blade.mission.PatrolMission import PatrolMission
+from blade.mission.StrikeMission import StrikeMission
+from blade.utils.utils import format_unit_id, to_camelcase
+
+SCENARIO_EXPORT_ENCODER = json.JSONEncoder(check_circular=False)
+
+
+def _export_color(color: Any) -> Any:
+    return color.value if isinstance(color, Enum) else color
+
+
+def _export_ids(ids: List[Any]) -> List[str]:
+    return [str(id) for id in ids]
+
+
+def _export_route(route: List[Any]) -> List[list]:
+    return [list(point) for point in route]
+
+
+def _export_units(units: List[Any]) -> List[dict]:
+    return [export_unit(unit) for unit in units]
+
+
+class ExportTable:
+    """
+    Precomputed camelCase keys of one class's to_dict, in the order the old
+    sort_keys export wrote them, and the conversions some of the values need.
+    """
+
+    def __init__(self, fields: Dict[str, Callable[[Any], Any] | None]):
+        attributes = sorted(fields)
+        self.keys: Tuple[str, ...] = tuple(
+            to_camelcase(attribute) for attribute in attributes
+        )
+        self.getter = attrgetter(*attributes)
+        self.conversions: Tuple[Tuple[str, Callable[[Any], Any]], ...] = tuple(
+            (to_camelcase(attribute), fields[attribute])
+            for attribute in attributes
+            if fields[attribute] is not None
+        )
+
+    def export(self, obj: Any) -> dict:
+        export = dict(zip(self.keys, self.getter(obj)))
+        for key, convert in self.conversions:
+            export[key] = convert(export[key])
+        return export
+
+
+_UNIT_FIELDS = {
+    "id": str,
+    "name": None,
+    "side_id": str,
+    "class_name": None,
+    "latitude": None,
+    "longitude": None,
+    "altitude": None,
+    "side_color": _export_color,
+}
+_MOVING_UNIT_FIELDS = {
+    **_UNIT_FIELDS,
+    "heading": None,
+    "speed": None,
+    "current_fuel": None,
+    "max_fuel": None,
+    "fuel_rate": None,
+    "range": None,
+    "route": _export_route,
+}
+
+EXPORT_TABLES: Dict[type, ExportTable] = {
+    Aircraft: ExportTable(
+        {
+            **_MOVING_UNIT_FIELDS,
+            "selected": None,
+            "weapons": _export_units,
+            "home_base_id": str,
+            "rtb": None,
+            "target_id": str,
+        }
+    ),
+    Ship: ExportTable(
+        {
+            **_MOVING_UNIT_FIELDS,
+            "selected": None,
+            "weapons": _export_units,
+            "aircraft": _export_units,
+        }
+    ),
+    Facility: ExportTable({**_UNIT_FIELDS, "range": None, "weapons": _export_units}),
+    Airbase: ExportTable({**_UNIT_FIELDS, "aircraft": _export_units}),
+    Weapon: ExportTable(
+        {
+            **_MOVING_UNIT_FIELDS,
+            "id": format_unit_id,
+            "target_id": format_unit_id,
+            "lethality": None,
+            "max_quantity": None,
+            "current_quantity": None,
+        }
+    ),
+    ReferencePoint: ExportTable(
+        {
+            "id": str,
+            "name": None,
+            "side_id": str,
+            "latitude": None,
+            "longitude": None,
+            "altitude": None,
+            "side_color": _export_color,
+        }
+    ),
+    Side: ExportTable(
+        {"id": str, "name": None, "total_score": None, "color": _export_color}
+    ),
+    PatrolMission: ExportTable(
+        {
+            "id": str,
+            "name": None,
+            "side_id": str,
+            "assigned_unit_ids": _export_ids,
+            "assigned_area": _export_units,
+            "active": None,
+        }
+    ),
+    StrikeMission: ExportTable(
+        {
+            "id": str,
+            "name": None,
+            "side_id": str,
+            "assigned_unit_ids": _export_ids,
+            "assigned_target_ids": _export_ids,
+            "active": None,
+        }
+    ),
+}
+
+
+def _camelcase_keys(value: Any) -> Any:
+    if isinstance(value, dict):
+        return {
+            to_camelcase(str(_export_color(key))): _camelcase_keys(item)
+            for key, item in sorted(value.items())
+        }
+    if isinstance(value, (list, tuple)):
+        return [_camelcase_keys(item) for item in value]
+    return value
+
+
+def export_unit(unit: Any) -> dict:
+    table = EXPORT_TABLES.get(type(unit))
+    if table is None:
+        return _camelcase_keys(unit.to_dict())
+    return table.export(unit)
+
+
+def _export_side_lists(side_lists: Dict[str, List[str]]) -> Dict[str, List[str]]:
+    return {side_id: list(side_lists[side_id]) for side_id in sorted(side_lists)}
+
+
+def _export_doctrine(doctrine: dict) -> dict:
+    export = {}
+    for side_id in sorted(doctrine):
+        side_doctrine = {
+            _export_color(doctrine_type): enabled
+            for doctrine_type, enabled in doctrine[side_id].items()
+        }
+        export[side_id] = {key: side_doctrine[key] for key in sorted(side_doctrine)}
+    return export
+
+
+def export_scenario_dict(scenario) -> dict:
+    """
+    The scenario as the camelCase dict the client loads, built straight from
+    the unit objects. It matches json.loads(to_camelcase(scenario.toJson())),
+    except that string values are no longer camelCased along with the keys.
+    """
+    relationships = scenario.relationships
+    return {
+        "airbases": _export_units(scenario.airbases),
+        "aircraft": _export_units(scenario.aircraft),
+        "currentTime": scenario.current_time,
+        "doctrine": _export_doctrine(scenario.doctrine),
+        "duration": scenario.duration,
+        "facilities": _export_units(scenario.facilities),
+        "id": scenario.id,
+        "missions": _export_units(scenario.missions),
+        "name": scenario.name,
+        "referencePoints": _export_units(scenario.reference_points),
+        "relationships": {
+            "allies": _export_side_lists(relationships.allies),
+            "hostiles": _export_side_lists(relationships.hostiles),
+        },
+        "ships": _export_units(scenario.ships),
+        "sides": _export_units(scenario.sides),
+        "startTime": scenario.start_time,
+        "timeCompression": scenario.time_compression,
+        "weapons": _export_units(scenario.weapons),
+    }
+
+
+def export_scenario_bytes(export_object: dict) -> bytes:
+    """UTF-8 JSON of an exported scenario, as written to a recording line."""
+    return SCENARIO_EXPORT_ENCODER.encode(export_object).encode("utf-8")
@@ -0,0 +1,318 @@
+import re
+import sys
+import json
+from typing import Any, Callable, Dict, Iterator, List, Optional, TextIO, Tuple
+
+from blade.units.Aircraft import Aircraft
+from blade.units.Ship import Ship
+from blade.units.Facility import Facility
+from blade.units.Airbase import Airbase
+from blade.units.Weapon import Weapon
+from blade.units.ReferencePoint import ReferencePoint
+from blade.Side import Side
+from blade.mission.PatrolMission import PatrolMission
+from blade.mission.StrikeMission import StrikeMission
+from blade.Scenario import Scenario
+from blade.Relationships import Relationships
+from blade.utils.utils import gc_paused, to_camelcase
+
+STREAM_CHUNK_SIZE = 1024 * 1024
+WHITESPACE_PATTERN = re.compile(r"[ \t\n\r]*")
+VALUE_DELIMITERS = ",:]}"
+# strings shared by many units, interned so every unit points at a single copy
+INTERNED_ARGUMENTS = ("side_id", "class_name", "home_base_id")
+
+
+class LoadTable:
+    """
+    Maps the camelCase keys of a saved unit to its constructor arguments.
+
+    Required fields raise a KeyError when missing, optional ones fall back to a
+    default. Fields with a loader (nested weapons, hosted aircraft, patrol areas)
+    are passed through it before the constructor is called.
+    """
+
+    def __init__(
+        self,
+        unit_class: type,
+        required: List[str],
+        optional: Optional[Dict[str, Any]] = None,
+        loaders: Optional[Dict[str, Callable[[Any], Any]]] = None,
+    ):
+        self.unit_class = unit_class
+        self.required: Tuple[Tuple[str, str], ...] = tuple(
+            (to_camelcase(argument), argument) for argument in required
+        )
+        self.optional: Tuple[Tuple[str, str, Any], ...] = tuple(
+            (to_camelcase(argument), argument, default)
+            for argument, default in (optional or {}).items()
+        )
+        self.loaders: Tuple[Tuple[str, Callable[[Any], Any]], ...] = tuple(
+            (loaders or {}).items()
+        )
+        self.interned: Tuple[str, ...] = tuple(
+            argument
+            for argument in INTERNED_ARGUMENTS
+            if argument in required or argument in (optional or {})
+        )
+
+    def load(self, saved_unit: dict) -> Any:
+        arguments = {argument: saved_unit[key] for key, argument in self.required}
+        for key, argument, default in self.optional:
+            arguments[argument] = saved_unit.get(key, default)
+        for argument, loader in self.loaders:
+            arguments[argument] = loader(arguments[argument])
+        for argument in self.interned:
+            value = arguments[argument]
+            if type(value) is str:
+                arguments[argument] = sys.intern(value)
+        return self.unit_class(**arguments)
+
+
+def _load_list(table: LoadTable) -> Callable[[Optional[list]], list]:
+    def load_list(saved_units: Optional[list]) -> list:
+        if not saved_units:
+            return []
+        return [table.load(saved_unit) for saved_unit in saved_units]
+
+    return load_list
+
+
+_UNIT_FIELDS = [
+    "id",
+    "name",
+    "side_id",
+    "class_name",
+    "latitude",
+    "longitude",
+    "altitude",
+    "side_color",
+]
+_MOVING_UNIT_FIELDS = _UNIT_FIELDS + [
+    "heading",
+    "speed",
+    "current_fuel",
+    "max_fuel",
+    "fuel_rate",
+    "range",
+    "route",
+]
+
+WEAPON_TABLE = LoadTable(
+    Weapon,
+    _MOVING_UNIT_FIELDS
+    + ["target_id", "lethality", "max_quantity", "current_quantity"],
+)
+_load_weapons = _load_list(WEAPON_TABLE)
+AIRCRAFT_TABLE = LoadTable(
+    Aircraft,
+    _MOVING_UNIT_FIELDS + ["selected", "weapons", "home_base_id", "rtb"],
+    optional={"target_id": ""},
+    loaders={"weapons": _load_weapons},
+)
+_load_aircraft = _load_list(AIRCRAFT_TABLE)
+SHIP_TABLE = LoadTable(
+    Ship,
+    _MOVING_UNIT_FIELDS + ["weapons", "aircraft"],
+    loaders={"weapons": _load_weapons, "aircraft": _load_aircraft},
+)
+FACILITY_TABLE = LoadTable(
+    Facility,
+    _UNIT_FIELDS + ["range", "weapons"],
+    loaders={"weapons": _load_weapons},
+)
+AIRBASE_TABLE = LoadTable(
+    Airbase, _UNIT_FIELDS + ["aircraft"], loaders={"aircraft": _load_aircraft}
+)
+REFERENCE_POINT_TABLE = LoadTable(
+    ReferencePoint,
+    ["id", "name", "side_id", "latitude", "longitude", "altitude", "side_color"],
+)
+PATROL_MISSION_TABLE = LoadTable(
+    PatrolMission,
+    ["id", "name", "side_id", "assigned_unit_ids", "assigned_area", "active"],
+    loaders={"assigned_area": _load_list(REFERENCE_POINT_TABLE)},
+)
+STRIKE_MISSION_TABLE = LoadTable(
+    StrikeMission,
+    ["id", "name", "side_id", "assigned_unit_ids", "assigned_target_ids", "active"],
+)
+SIDE_TABLE = LoadTable(Side, ["id", "name", "total_score", "color"])
+
+
+def load_mission(saved_mission: dict) -> PatrolMission | StrikeMission:
+    if "assignedArea" in saved_mission:
+        return PATROL_MISSION_TABLE.load(saved_mission)
+    return STRIKE_MISSION_TABLE.load(saved_mission)
+
+
+# saved scenario key -> (Scenario argument, loader for one saved unit)
+UNIT_LIST_LOADERS: Dict[str, Tuple[str, Callable[[dict], Any]]] = {
+    "aircraft": ("aircraft", AIRCRAFT_TABLE.load),
+    "airbases": ("airbases", AIRBASE_TABLE.load),
+    "facilities": ("facilities", FACILITY_TABLE.load),
+    "weapons": ("weapons", WEAPON_TABLE.load),
+    "ships": ("ships", SHIP_TABLE.load),
+    "referencePoints": ("reference_points", REFERENCE_POINT_TABLE.load),
+    "missions": ("missions", load_mission),
+}
+OPTIONAL_UNIT_LISTS = ("referencePoints", "missions")
+
+
+def _build_scenario(saved_scenario: dict, units: Dict[str, list]) -> Scenario:
+    for key in UNIT_LIST_LOADERS:
+        if key not in units and key not in OPTIONAL_UNIT_LISTS:
+            raise KeyError(key)
+    saved_relationships = saved_scenario.get("relationships", {})
+    return Scenario(
+        id=saved_scenario["id"],
+        name=saved_scenario["name"],
+        start_time=saved_scenario["startTime"],
+        current_time=saved_scenario["currentTime"],
+        duration=saved_scenario["duration"],
+        sides=[SIDE_TABLE.load(side) for side in saved_scenario["sides"]],
+        time_compression=saved_scenario["timeCompression"],
+        relationships=Relationships(
+            hostiles=saved_relationships.get("hostiles") or {},
+            allies=saved_relationships.get("allies") or {},
+        ),
+        doctrine=saved_scenario["doctrine"],
+        **{
+            UNIT_LIST_LOADERS[key][0]: loaded_units
+            for key, loaded_units in units.items()
+        },
+    )
+
+
+def load_scenario_object(saved_scenario: dict) -> Scenario:
+    """Builds a Scenario from the parsed "currentScenario" of a saved scenario."""
+    units = {}
+    for key, (_, load_unit) in UNIT_LIST_LOADERS.items():
+        if key in saved_scenario:
+            units[key] = [load_unit(saved_unit) for saved_unit in saved_scenario[key]]
+    return _build_scenario(saved_scenario, units)
+
+
+def load_scenario_string(scenario_string: str) -> Tuple[dict, Scenario]:
+    """
+    Parses a saved scenario (Game.export_scenario format) and returns the rest of
+    the saved object (currentSideId, mapView, ...) and the loaded Scenario.
+    """
+    with gc_paused():
+        import_object = json.loads(scenario_string)
+        scenario = load_scenario_object(import_object.pop("currentScenario"))
+    return import_object, scenario
+
+
+class JsonStream:
+    """
+    Incremental reader over a JSON text file. Values are decoded one at a time
+    from a rolling buffer, so large arrays can be consumed item by item without
+    holding the whole document in memory.
+    """
+
+    def __init__(self, file: TextIO, chunk_size: int = STREAM_CHUNK_SIZE):
+        self.file = file
+        self.chunk_size = chunk_size
+        self.buffer = ""
+        self.position = 0
+        self.eof = False
+        self.decoder = json.JSONDecoder()
+
+    def _fill(self) -> bool:
+        if self.eof:
+            return False
+        chunk = self.file.read(self.chunk_size)
+        if not chunk:
+            self.eof = True
+            return False
+        self.buffer = self.buffer[self.position :] + chunk
+        self.position = 0
+        return True
+
+    def peek(self) -> str:
+        while True:
+            self.position = WHITESPACE_PATTERN.match(self.buffer, self.position).end()
+            if self.position < len(self.buffer):
+                return self.buffer[self.position]
+            if not self._fill():
+                raise ValueError("Unexpected end of JSON input")
+
+    def expect(self, character: str) -> None:
+        if self.peek() != character:
+            raise ValueError(
+                f"Expected '{character}' but found '{self.buffer[self.position]}'"
+            )
+        self.position += 1
+
+    def value(self) -> Any:
+        self.peek()
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.position)
+                # a number cut off by the end of the buffer still decodes, so only
+                # trust a value that is followed by a delimiter
+                next_position = WHITESPACE_PATTERN.match(self.buffer, end).end()
+                if self.eof or (
+                    next_position < len(self.buffer)
+                    and self.buffer[next_position] in VALUE_DELIMITERS
+                ):
+                    self.position = end
+                    return value
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise
+            self._fill()
+
+    def _iter_items(self, opening: str, closing: str) -> Iterator[None]:
+        self.expect(opening)
+        if self.peek() == closing:
+            self.position += 1
+            return
+        while True:
+            yield
+            if self.peek() == ",":
+                self.position += 1
+                continue
+            self.expect(closing)
+            return
+
+    def iter_keys(self) -> Iterator[str]:
+        """Yields each key of an object, the caller must read its value."""
+        for _ in self._iter_items("{", "}"):
+            key = self.value()
+            self.expect(":")
+            yield key
+
+    def iter_array(self) -> Iterator[Any]:
+        for _ in self._iter_items("[", "]"):
+            yield self.value()
+
+
+def load_scenario_file(file_path: str) -> Tuple[dict, Scenario]:
+    """
+    Like load_scenario_string, but streams the file and builds each unit as soon
+    as it is parsed, so the saved unit dicts never all exist at once.
+    """
+    import_object = {}
+    scenario = None
+    with open(file_path, "r", encoding="utf-8") as scenario_file, gc_paused():
+        stream = JsonStream(scenario_file)
+        for key in stream.iter_keys():
+            if key != "currentScenario":
+                import_object[key] = stream.value()
+                continue
+            saved_scenario = {}
+            units = {}
+            for scenario_key in stream.iter_keys():
+                if scenario_key not in UNIT_LIST_LOADERS:
+                    saved_scenario[scenario_key] = stream.value()
+                    continue
+                load_unit = UNIT_LIST_LOADERS[scenario_key][1]
+                units[scenario_key] = [
+                    load_unit(saved_unit) for saved_unit in stream.iter_array()
+                ]
+            scenario = _build_scenario(saved_scenario, units)
+    if scenario is None:
+        raise KeyError("currentScenario")
+    return import_object, scenario
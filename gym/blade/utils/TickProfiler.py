@@ -0,0 +1,92 @@
+import csv
+import json
+from collections import deque
+from typing import Deque, Dict, Iterator, Optional, Tuple
+
+CSV_COLUMNS = ("tick", "phase", "seconds", "calls", "units")
+# root frame of the collapsed stacks written by write_folded
+FOLDED_ROOT_FRAME = "update_game_state"
+
+
+def _new_stats() -> dict:
+    return {"seconds": 0.0, "calls": 0, "units": 0}
+
+
+class TickProfiler:
+    """
+    Records the wall time, call count and number of units processed by each phase
+    of Game.update_game_state, per tick and in total.
+
+    Profiling is opt-in: pass a profiler to Game or set game.profiler. Only the
+    last max_ticks ticks are kept when it is given, the totals cover every tick.
+    """
+
+    def __init__(self, max_ticks: Optional[int] = None):
+        self.max_ticks = max_ticks
+        # (scenario time the tick started at, phase -> stats) of every recorded tick
+        self.ticks: Deque[Tuple[int, Dict[str, dict]]] = deque(maxlen=max_ticks)
+        self.totals: Dict[str, dict] = {}
+        self._tick_stats: Dict[str, dict] = {}
+
+    def start_tick(self, scenario_time: int) -> None:
+        self._tick_stats = {}
+        self.ticks.append((scenario_time, self._tick_stats))
+
+    def record(self, phase: str, seconds: float, units: int = 0) -> None:
+        for stats in (
+            self._tick_stats.setdefault(phase, _new_stats()),
+            self.totals.setdefault(phase, _new_stats()),
+        ):
+            stats["seconds"] += seconds
+            stats["calls"] += 1
+            stats["units"] += units
+
+    def reset(self) -> None:
+        self.ticks.clear()
+        self.totals = {}
+        self._tick_stats = {}
+
+    def summary(self) -> Dict[str, dict]:
+        """Totals per phase, with the mean seconds per call."""
+        return {
+            phase: {**stats, "mean_seconds": stats["seconds"] / stats["calls"]}
+            for phase, stats in self.totals.items()
+        }
+
+    def iter_rows(self) -> Iterator[Tuple[int, str, float, int, int]]:
+        for scenario_time, tick_stats in self.ticks:
+            for phase, stats in tick_stats.items():
+                yield (
+                    scenario_time,
+                    phase,
+                    stats["seconds"],
+                    stats["calls"],
+                    stats["units"],
+                )
+
+    def write_csv(self, file_path: str) -> None:
+        """One row per phase per recorded tick."""
+        with open(file_path, "w", newline="", encoding="utf-8") as csv_file:
+            writer = csv.writer(csv_file)
+            writer.writerow(CSV_COLUMNS)
+            writer.writerows(self.iter_rows())
+
+    def write_json(self, file_path: str) -> None:
+        with open(file_path, "w", encoding="utf-8") as json_file:
+            json.dump(
+                {
+                    "summary": self.summary(),
+                    "ticks": [dict(zip(CSV_COLUMNS, row)) for row in self.iter_rows()],
+                },
+                json_file,
+            )
+
+    def write_folded(self, file_path: str) -> None:
+        """
+        Total microseconds per phase as collapsed stacks ("frame;frame count"),
+        the input format of flamegraph.pl, speedscope and inferno.
+        """
+        with open(file_path, "w", encoding="utf-8") as folded_file:
+            for phase, stats in self.totals.items():
+                microseconds = round(stats["seconds"] * 1e6)
+                folded_file.write(f"{FOLDED_ROOT_FRAME};{phase} {microseconds}\n")
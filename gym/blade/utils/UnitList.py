@@ -0,0 +1,181 @@
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+
+class UnitList(list):
+    """
+    A list of units that also keeps an id -> unit index in sync with its contents.
+
+    It behaves like the plain lists the scenario used before, so callers can keep
+    appending, removing and iterating, but lookups by id are constant time.
+    """
+
+    def __init__(self, units: Iterable[Any] = ()):
+        super().__init__(units)
+        self._units_by_id: Dict[str, Any] = {}
+        # units removed since defer_removals by object id, None when not deferring
+        self._pending_removals: Optional[Dict[int, Any]] = None
+        self._reindex()
+
+    def __reduce__(self):
+        return (self.__class__, (list(self.iter_remaining()),))
+
+    def _reindex(self) -> None:
+        self._units_by_id = {}
+        for unit in self.iter_remaining():
+            self._index(unit)
+
+    def _index(self, unit: Any) -> None:
+        self._units_by_id.setdefault(unit.id, unit)
+
+    def _unindex(self, unit: Any) -> None:
+        if self._units_by_id.get(unit.id) is unit:
+            del self._units_by_id[unit.id]
+
+    def get(self, unit_id: str) -> Optional[Any]:
+        return self._units_by_id.get(unit_id)
+
+    def has(self, unit_id: str) -> bool:
+        return unit_id in self._units_by_id
+
+    def remove_by_id(self, unit_id: str) -> Optional[Any]:
+        unit = self._units_by_id.get(unit_id)
+        if unit is not None:
+            self.remove(unit)
+        return unit
+
+    def append(self, unit: Any) -> None:
+        super().append(unit)
+        self._index(unit)
+
+    def extend(self, units: Iterable[Any]) -> None:
+        units = list(units)
+        super().extend(units)
+        for unit in units:
+            self._index(unit)
+
+    def __iadd__(self, units: Iterable[Any]):
+        self.extend(units)
+        return self
+
+    def insert(self, index: int, unit: Any) -> None:
+        super().insert(index, unit)
+        self._index(unit)
+
+    def remove(self, unit: Any) -> None:
+        pending = self._pending_removals
+        if pending is None:
+            super().remove(unit)
+        elif id(unit) in pending or (
+            self._units_by_id.get(unit.id) is not unit and unit not in self
+        ):
+            raise ValueError("UnitList.remove(x): x not in list")
+        else:
+            pending[id(unit)] = unit
+        self._unindex(unit)
+
+    def defer_removals(self) -> None:
+        """
+        Until apply_removals, a removed unit leaves the id index at once but stays
+        in the list, skipped by iter_remaining, so loops over the list never skip
+        a unit. The list is then compacted in a single pass.
+        """
+        if self._pending_removals is None:
+            self._pending_removals = {}
+
+    def apply_removals(self) -> None:
+        pending = self._pending_removals
+        self._pending_removals = None
+        if pending:
+            super().__setitem__(
+                slice(None), [unit for unit in self if id(unit) not in pending]
+            )
+
+    def iter_remaining(self) -> Iterator[Any]:
+        """Iterates the units, skipping those removed while removals are deferred."""
+        for unit in self:
+            pending = self._pending_removals
+            if pending is None or id(unit) not in pending:
+                yield unit
+
+    def pop(self, index: int = -1) -> Any:
+        unit = super().pop(index)
+        self._unindex(unit)
+        return unit
+
+    def clear(self) -> None:
+        super().clear()
+        self._reindex()
+
+    def __setitem__(self, index, value) -> None:
+        super().__setitem__(index, value)
+        self._reindex()
+
+    def __delitem__(self, index) -> None:
+        super().__delitem__(index)
+        self._reindex()
+
+    def __imul__(self, count: int):
+        super().__imul__(count)
+        self._reindex()
+        return self
+
+
+class WeaponList(UnitList):
+    """
+    A UnitList of in-flight weapons that also groups the weapons by target id, in
+    list order.
+    """
+
+    def __init__(self, units: Iterable[Any] = ()):
+        # launched weapons are numbered per scenario, so runs can be reproduced
+        self.next_launch_id = 1
+        # side id -> weapons launched in the scenario
+        self.launches_by_side: Dict[str, int] = {}
+        super().__init__(units)
+
+    def __reduce__(self):
+        return (
+            self.__class__,
+            (list(self.iter_remaining()),),
+            {
+                "next_launch_id": self.next_launch_id,
+                "launches_by_side": dict(self.launches_by_side),
+            },
+        )
+
+    def _reindex(self) -> None:
+        self._weapons_by_target: Dict[str, Dict[int, Any]] = {}
+        super()._reindex()
+
+    def _index(self, weapon: Any) -> None:
+        super()._index(weapon)
+        inbound = self._weapons_by_target.get(weapon.target_id)
+        if inbound is None:
+            inbound = self._weapons_by_target[weapon.target_id] = {}
+        inbound[id(weapon)] = weapon
+
+    def _unindex(self, weapon: Any) -> None:
+        super()._unindex(weapon)
+        inbound = self._weapons_by_target.get(weapon.target_id)
+        if inbound is not None:
+            inbound.pop(id(weapon), None)
+            if not inbound:
+                del self._weapons_by_target[weapon.target_id]
+
+    def take_launch_id(self, side_id: str) -> int:
+        """The id for a weapon the side launches, counting the launch."""
+        self.launches_by_side[side_id] = self.launches_by_side.get(side_id, 0) + 1
+        # a restored scenario may already use some of the ids
+        weapon_id = self.next_launch_id
+        while self.has(weapon_id):
+            weapon_id += 1
+        self.next_launch_id = weapon_id + 1
+        return weapon_id
+
+    def count_targeting(self, target_id: str) -> int:
+        return len(self._weapons_by_target.get(target_id, ()))
+
+    def get_targeting(self, target_id: str) -> List[Any]:
+        """The weapons headed for the target, in the order they are listed."""
+        inbound = self._weapons_by_target.get(target_id)
+        return list(inbound.values()) if inbound is not None else []
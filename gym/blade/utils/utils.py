@@ -1,10 +1,18 @@
+import gc
 import re
 import math
 import random
+from uuid import NAMESPACE_OID, UUID, uuid4, uuid5
+from contextlib import contextmanager
+import numpy as np
+from numpy.typing import ArrayLike
 from datetime import datetime
-from typing import List
+from typing import Iterator, List, Optional, Tuple
 from blade.utils.constants import EARTH_RADIUS_KM, KILOMETERS_TO_NAUTICAL_MILES
 
+# launched weapons have integer ids, exported under a fixed uuid-shaped prefix
+LAUNCHED_WEAPON_ID_PREFIX = str(uuid5(NAMESPACE_OID, "blade.launched_weapon"))[:23]
+
 
 def to_radians(degrees: float) -> float:
     return math.radians(degrees)
@@ -87,12 +95,27 @@ def get_terminal_coordinates_from_distance_and_bearing(
     return [final_latitude, final_longitude]
 
 
-def random_float(min_value: float, max_value: float) -> float:
-    return random.uniform(min_value, max_value)
+def random_float(
+    min_value: float, max_value: float, rng: Optional[np.random.Generator] = None
+) -> float:
+    if rng is None:
+        return random.uniform(min_value, max_value)
+    return float(rng.uniform(min_value, max_value))
+
 
+def random_int(
+    min_value: int, max_value: int, rng: Optional[np.random.Generator] = None
+) -> int:
+    if rng is None:
+        return random.randint(min_value, max_value)
+    return int(rng.integers(min_value, max_value, endpoint=True))
 
-def random_int(min_value: int, max_value: int) -> int:
-    return random.randint(min_value, max_value)
+
+def random_uuid(rng: Optional[np.random.Generator] = None) -> str:
+    """A random version 4 uuid, drawn from rng when one is given."""
+    if rng is None:
+        return str(uuid4())
+    return str(UUID(bytes=rng.bytes(16), version=4))
 
 
 def get_next_coordinates(
@@ -101,6 +124,7 @@ def get_next_coordinates(
     destination_latitude: float,
     destination_longitude: float,
     platform_speed: float,
+    seconds: float = 1,
 ) -> List[float]:
     heading = get_bearing_between_two_points(
         origin_latitude, origin_longitude, destination_latitude, destination_longitude
@@ -114,7 +138,7 @@ def get_next_coordinates(
     total_time_seconds = max(
         math.floor(total_time_hours * 3600), 0.0001
     )  # prevent divide-by-zero
-    leg_distance_km = total_distance_km / total_time_seconds
+    leg_distance_km = total_distance_km / total_time_seconds * seconds
 
     if total_distance_km < leg_distance_km:
         return [destination_latitude, destination_longitude]
@@ -124,6 +148,133 @@ def get_next_coordinates(
     )
 
 
+def get_bearings_between_points(
+    start_latitude: ArrayLike,
+    start_longitude: ArrayLike,
+    destination_latitude: ArrayLike,
+    destination_longitude: ArrayLike,
+) -> np.ndarray:
+    # broadcasts like numpy: pairwise for equal-length arrays, one-to-many for a scalar start
+    φ1 = np.radians(start_latitude)
+    φ2 = np.radians(destination_latitude)
+    Δλ = np.radians(np.subtract(destination_longitude, start_longitude))
+
+    y = np.sin(Δλ) * np.cos(φ2)
+    x = np.cos(φ1) * np.sin(φ2) - np.sin(φ1) * np.cos(φ2) * np.cos(Δλ)
+    return (np.degrees(np.arctan2(y, x)) + 360) % 360
+
+
+def get_distances_between_points(
+    start_latitude: ArrayLike,
+    start_longitude: ArrayLike,
+    destination_latitude: ArrayLike,
+    destination_longitude: ArrayLike,
+) -> np.ndarray:
+    φ1 = np.radians(start_latitude)
+    φ2 = np.radians(destination_latitude)
+    Δφ = np.radians(np.subtract(destination_latitude, start_latitude))
+    Δλ = np.radians(np.subtract(destination_longitude, start_longitude))
+
+    a = np.sin(Δφ / 2) ** 2 + np.cos(φ1) * np.cos(φ2) * np.sin(Δλ / 2) ** 2
+    c = 2 * np.arctan2(np.sqrt(a), np.sqrt(1 - a))
+
+    return EARTH_RADIUS_KM * c  # in kilometers
+
+
+def get_bearing_matrix(
+    start_latitudes: ArrayLike,
+    start_longitudes: ArrayLike,
+    destination_latitudes: ArrayLike,
+    destination_longitudes: ArrayLike,
+) -> np.ndarray:
+    # many-to-many: element [i, j] is the bearing from start i to destination j
+    return get_bearings_between_points(
+        np.asarray(start_latitudes)[:, np.newaxis],
+        np.asarray(start_longitudes)[:, np.newaxis],
+        np.asarray(destination_latitudes)[np.newaxis, :],
+        np.asarray(destination_longitudes)[np.newaxis, :],
+    )
+
+
+def get_distance_matrix(
+    start_latitudes: ArrayLike,
+    start_longitudes: ArrayLike,
+    destination_latitudes: ArrayLike,
+    destination_longitudes: ArrayLike,
+) -> np.ndarray:
+    # many-to-many: element [i, j] is the distance from start i to destination j
+    return get_distances_between_points(
+        np.asarray(start_latitudes)[:, np.newaxis],
+        np.asarray(start_longitudes)[:, np.newaxis],
+        np.asarray(destination_latitudes)[np.newaxis, :],
+        np.asarray(destination_longitudes)[np.newaxis, :],
+    )
+
+
+def get_terminal_coordinates_from_distances_and_bearings(
+    start_latitude: ArrayLike,
+    start_longitude: ArrayLike,
+    distance: ArrayLike,
+    bearing: ArrayLike,
+) -> Tuple[np.ndarray, np.ndarray]:
+    bearing_in_radians = np.radians(bearing)
+    angular_distance = np.divide(distance, EARTH_RADIUS_KM)
+
+    initial_latitude = np.radians(start_latitude)
+    initial_longitude = np.radians(start_longitude)
+
+    final_latitude = np.arcsin(
+        np.sin(initial_latitude) * np.cos(angular_distance)
+        + np.cos(initial_latitude)
+        * np.sin(angular_distance)
+        * np.cos(bearing_in_radians)
+    )
+    final_longitude = initial_longitude + np.arctan2(
+        np.sin(bearing_in_radians)
+        * np.sin(angular_distance)
+        * np.cos(initial_latitude),
+        np.cos(angular_distance) - np.sin(initial_latitude) * np.sin(final_latitude),
+    )
+
+    return np.degrees(final_latitude), np.degrees(final_longitude)
+
+
+def get_next_coordinates_for_points(
+    origin_latitude: ArrayLike,
+    origin_longitude: ArrayLike,
+    destination_latitude: ArrayLike,
+    destination_longitude: ArrayLike,
+    platform_speed: ArrayLike,
+    seconds: float = 1,
+) -> Tuple[np.ndarray, np.ndarray]:
+    heading = get_bearings_between_points(
+        origin_latitude, origin_longitude, destination_latitude, destination_longitude
+    )
+    total_distance_km = get_distances_between_points(
+        origin_latitude, origin_longitude, destination_latitude, destination_longitude
+    )
+    with np.errstate(divide="ignore", invalid="ignore"):
+        total_time_hours = (total_distance_km * KILOMETERS_TO_NAUTICAL_MILES) / np.abs(
+            platform_speed
+        )
+        total_time_seconds = np.maximum(
+            np.floor(total_time_hours * 3600), 0.0001
+        )  # prevent divide-by-zero
+        leg_distance_km = total_distance_km / total_time_seconds * seconds
+
+    next_latitude, next_longitude = (
+        get_terminal_coordinates_from_distances_and_bearings(
+            origin_latitude, origin_longitude, leg_distance_km, heading
+        )
+    )
+    reached = total_distance_km < leg_distance_km
+
+    return (
+        np.where(reached, destination_latitude, next_latitude),
+        np.where(reached, destination_longitude, next_longitude),
+    )
+
+
 def to_camelcase(s):
     return re.sub(r"(?!^)_([a-zA-Z])", lambda m: m.group(1).upper(), s)
 
@@ -132,3 +283,22 @@ def unix_to_local_time(unix_timestamp: int, separator: str = ":") -> str:
     date = datetime.fromtimestamp(unix_timestamp)
     formatted_time = date.strftime(f"%H{separator}%M{separator}%S")
     return formatted_time
+
+
+@contextmanager
+def gc_paused() -> Iterator[None]:
+    """Pauses the cyclic garbage collector while building long-lived objects."""
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
+
+
+def format_unit_id(unit_id) -> str:
+    """The id as exported, integer weapon ids become uuid-shaped strings."""
+    if type(unit_id) is int:
+        return f"{LAUNCHED_WEAPON_ID_PREFIX}-{unit_id:012x}"
+    return str(unit_id)
@@ -0,0 +1,15 @@
+import time
+
+from scripts.generate_load_test_scenario import generate_scenario
+
+__all__ = ["generate_scenario", "time_it"]
+
+
+def time_it(fnc, repeats: int) -> float:
+    """Best wall time in seconds over several runs."""
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fnc()
+        best = min(best, time.perf_counter() - start)
+    return best
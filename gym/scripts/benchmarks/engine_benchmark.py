@@ -0,0 +1,212 @@
+import sys
+import json
+import time
+import random
+import argparse
+import platform
+import tracemalloc
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from scripts.benchmarks.common import generate_scenario, time_it
+from blade.Game import Game
+from blade.Scenario import Scenario
+from blade.utils.TickProfiler import TickProfiler
+
+RESULTS_VERSION = 1
+# generated weapons carry no fuel, which gives them no engagement range
+WEAPON_FUEL = 50
+WEAPON_FUEL_RATE = 100
+# metric -> True if a larger value is better
+METRICS = {
+    "load_seconds": False,
+    "reset_seconds": False,
+    "export_seconds": False,
+    "ticks_per_second": True,
+    "peak_memory_mb": False,
+}
+
+
+def parse_counts(counts: str) -> List[int]:
+    return [int(count) for count in counts.split(",") if count.strip()]
+
+
+def prepare_for_combat(scenario: dict) -> None:
+    """Makes every side hostile to the others and fuels the generated weapons."""
+    current_scenario = scenario["currentScenario"]
+    side_ids = [side["id"] for side in current_scenario["sides"]]
+    for side_id in side_ids:
+        current_scenario["relationships"]["hostiles"][side_id] = [
+            hostile_id for hostile_id in side_ids if hostile_id != side_id
+        ]
+    for unit_list in ("aircraft", "ships", "facilities"):
+        for unit in current_scenario[unit_list]:
+            for weapon in unit["weapons"]:
+                weapon["currentFuel"] = WEAPON_FUEL
+                weapon["maxFuel"] = WEAPON_FUEL
+                weapon["fuelRate"] = WEAPON_FUEL_RATE
+
+
+def run_ticks(game: Game, ticks: int, seed: int) -> float:
+    game.reset()
+    random.seed(seed)
+    start = time.perf_counter()
+    summary = game.advance(ticks)
+    return summary["ticks"] / (time.perf_counter() - start)
+
+
+def benchmark_scenario(
+    sides: int, units: int, ticks: int, repeats: int, seed: int, profile: bool
+) -> dict:
+    random.seed(seed)
+    scenario = generate_scenario(sides, units)
+    prepare_for_combat(scenario)
+    scenario_string = json.dumps(scenario)
+
+    game = Game(current_scenario=Scenario())
+    load_seconds = time_it(lambda: game.load_scenario(scenario_string), repeats)
+    reset_seconds = time_it(game.reset, repeats)
+    ticks_per_second = max(run_ticks(game, ticks, seed) for _ in range(repeats))
+    export_seconds = time_it(game.export_scenario, repeats)
+
+    tracemalloc.start()
+    game.load_scenario(scenario_string)
+    run_ticks(game, ticks, seed)
+    peak_memory = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    result = {
+        "sides": sides,
+        "units": units,
+        "total_units": sum(
+            len(getattr(game.current_scenario, unit_list))
+            for unit_list in ("aircraft", "ships", "facilities", "airbases")
+        ),
+        "ticks": ticks,
+        "load_seconds": load_seconds,
+        "reset_seconds": reset_seconds,
+        "export_seconds": export_seconds,
+        "ticks_per_second": ticks_per_second,
+        "peak_memory_mb": peak_memory / 1024 / 1024,
+    }
+    if profile:
+        game.profiler = TickProfiler()
+        run_ticks(game, ticks, seed)
+        result["phases"] = game.profiler.summary()
+    return result
+
+
+def compare_results(
+    baseline: dict, results: dict, threshold: float
+) -> List[Tuple[int, int, str, float, float]]:
+    """(sides, units, metric, baseline, current) of every metric that got worse."""
+    baseline_runs: Dict[Tuple[int, int], dict] = {
+        (run["sides"], run["units"]): run for run in baseline["results"]
+    }
+    regressions = []
+    for run in results["results"]:
+        baseline_run = baseline_runs.get((run["sides"], run["units"]))
+        if baseline_run is None:
+            continue
+        for metric, higher_is_better in METRICS.items():
+            old_value = baseline_run[metric]
+            new_value = run[metric]
+            if higher_is_better:
+                worse = new_value < old_value * (1 - threshold)
+            else:
+                worse = new_value > old_value * (1 + threshold)
+            if worse:
+                regressions.append(
+                    (run["sides"], run["units"], metric, old_value, new_value)
+                )
+    return regressions
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Measure the engine on generated load test scenarios"
+    )
+    parser.add_argument(
+        "-s", "--sides", default="2,3", help="Comma separated side counts to sweep"
+    )
+    parser.add_argument(
+        "-u",
+        "--units",
+        default="20,60",
+        help="Comma separated numbers of each unit type per side to sweep",
+    )
+    parser.add_argument(
+        "-t", "--ticks", type=int, default=20, help="Number of ticks to time per run"
+    )
+    parser.add_argument(
+        "-r", "--repeats", type=int, default=3, help="Number of timed runs per metric"
+    )
+    parser.add_argument(
+        "--seed", type=int, default=0, help="Seed for the scenario and the engine"
+    )
+    parser.add_argument("-o", "--output", help="Write the results as JSON to this file")
+    parser.add_argument(
+        "-c", "--compare", help="Results JSON of an earlier run to compare against"
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.1,
+        help="Relative change counted as a regression when comparing",
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Also record per-phase tick timings with a TickProfiler",
+    )
+    args = parser.parse_args()
+
+    results = {
+        "version": RESULTS_VERSION,
+        "environment": {
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "platform": platform.platform(),
+            "processor": platform.processor(),
+        },
+        "config": {
+            "ticks": args.ticks,
+            "repeats": args.repeats,
+            "seed": args.seed,
+        },
+        "results": [],
+    }
+    print(
+        f"{'sides':>5} {'units':>6} {'load ms':>9} {'reset ms':>9} "
+        f"{'export ms':>10} {'ticks/s':>9} {'peak MB':>8}"
+    )
+    for sides in parse_counts(args.sides):
+        for units in parse_counts(args.units):
+            run = benchmark_scenario(
+                sides, units, args.ticks, args.repeats, args.seed, args.profile
+            )
+            results["results"].append(run)
+            print(
+                f"{sides:>5} {units:>6} {run['load_seconds'] * 1000:>9.1f} "
+                f"{run['reset_seconds'] * 1000:>9.1f} "
+                f"{run['export_seconds'] * 1000:>10.1f} "
+                f"{run['ticks_per_second']:>9.1f} {run['peak_memory_mb']:>8.1f}"
+            )
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as output_file:
+            json.dump(results, output_file, indent=2)
+
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as baseline_file:
+            baseline = json.load(baseline_file)
+        regressions = compare_results(baseline, results, args.threshold)
+        for sides, units, metric, old_value, new_value in regressions:
+            print(
+                f"Regression: {sides} sides x {units} units {metric} "
+                f"{old_value:.4g} -> {new_value:.4g}"
+            )
+        if regressions:
+            sys.exit(1)
+        print(f"No regressions over {args.threshold:.0%} against {args.compare}")
@@ -0,0 +1,81 @@
+import os
+import json
+import argparse
+import tempfile
+import tracemalloc
+
+from scripts.benchmarks.common import generate_scenario, time_it
+from blade.Game import Game
+from blade.Scenario import Scenario
+from blade.utils.ScenarioLoader import load_scenario_object
+
+
+def peak_memory(fnc) -> float:
+    """Peak traced allocation in MB while running fnc."""
+    tracemalloc.start()
+    fnc()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak / 1024 / 1024
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Time Game.load_scenario and the streaming Game.load_scenario_file"
+    )
+    parser.add_argument(
+        "-s", "--sides", type=int, default=2, help="Number of sides to generate"
+    )
+    parser.add_argument(
+        "-u",
+        "--units",
+        type=int,
+        default=2000,
+        help="Number of each unit type per side",
+    )
+    parser.add_argument(
+        "-r", "--repeats", type=int, default=5, help="Number of timed runs per method"
+    )
+    args = parser.parse_args()
+
+    scenario_string = json.dumps(generate_scenario(args.sides, args.units))
+    with tempfile.NamedTemporaryFile(
+        "w", suffix=".json", delete=False, encoding="utf-8"
+    ) as scenario_file:
+        scenario_file.write(scenario_string)
+    try:
+        game = Game(current_scenario=Scenario())
+        saved_scenario = json.loads(scenario_string)["currentScenario"]
+
+        parse_seconds = time_it(lambda: json.loads(scenario_string), args.repeats)
+        build_seconds = time_it(
+            lambda: load_scenario_object(saved_scenario), args.repeats
+        )
+        load_seconds = time_it(
+            lambda: game.load_scenario(scenario_string), args.repeats
+        )
+        load_file_seconds = time_it(
+            lambda: game.load_scenario_file(scenario_file.name), args.repeats
+        )
+        snapshot_seconds = time_it(game.current_scenario.snapshot, args.repeats)
+
+        def load_from_disk():
+            with open(scenario_file.name, "r", encoding="utf-8") as file:
+                game.load_scenario(file.read())
+
+        load_peak = peak_memory(load_from_disk)
+        load_file_peak = peak_memory(
+            lambda: game.load_scenario_file(scenario_file.name)
+        )
+    finally:
+        os.remove(scenario_file.name)
+
+    print(f"Scenario: {args.sides} sides x {args.units} units per type")
+    print(f"Scenario size: {len(scenario_string) / 1024 / 1024:.2f} MB")
+    print(f"json.loads:               {parse_seconds * 1000:.1f} ms")
+    print(f"load_scenario_object:     {build_seconds * 1000:.1f} ms")
+    print(f"Scenario.snapshot:        {snapshot_seconds * 1000:.1f} ms")
+    print(f"Game.load_scenario:       {load_seconds * 1000:.1f} ms")
+    print(f"Game.load_scenario_file:  {load_file_seconds * 1000:.1f} ms")
+    print(f"Peak memory, read + load_scenario: {load_peak:.1f} MB")
+    print(f"Peak memory, load_scenario_file:   {load_file_peak:.1f} MB")
@@ -0,0 +1,40 @@
+import copy
+import json
+import argparse
+
+from scripts.benchmarks.common import generate_scenario, time_it
+from blade.Game import Game
+from blade.Scenario import Scenario
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Compare copy.deepcopy with Scenario.snapshot/restore"
+    )
+    parser.add_argument(
+        "-s", "--sides", type=int, default=2, help="Number of sides to generate"
+    )
+    parser.add_argument(
+        "-u", "--units", type=int, default=500, help="Number of each unit type per side"
+    )
+    parser.add_argument(
+        "-r", "--repeats", type=int, default=5, help="Number of timed runs per method"
+    )
+    args = parser.parse_args()
+
+    game = Game(current_scenario=Scenario())
+    game.load_scenario(json.dumps(generate_scenario(args.sides, args.units)))
+    scenario = game.current_scenario
+    snapshot = scenario.snapshot()
+
+    deepcopy_seconds = time_it(lambda: copy.deepcopy(scenario), args.repeats)
+    snapshot_seconds = time_it(lambda: scenario.snapshot(), args.repeats)
+    restore_seconds = time_it(lambda: Scenario.restore(snapshot), args.repeats)
+    reset_seconds = time_it(game.reset, args.repeats)
+
+    print(f"Scenario: {args.sides} sides x {args.units} units per type")
+    print(f"Snapshot size: {len(snapshot) / 1024 / 1024:.2f} MB")
+    print(f"copy.deepcopy:     {deepcopy_seconds * 1000:.1f} ms")
+    print(f"Scenario.snapshot: {snapshot_seconds * 1000:.1f} ms")
+    print(f"Scenario.restore:  {restore_seconds * 1000:.1f} ms")
+    print(f"Game.reset:        {reset_seconds * 1000:.1f} ms")
+    print(f"Restore speedup over deepcopy: {deepcopy_seconds / restore_seconds:.1f}x")
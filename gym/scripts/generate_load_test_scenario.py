@@ -60,6 +60,7 @@ def generate_scenario(num_sides: int, units_per_side: int) -> dict:
             "weapons": [],
             "missions": [],
             "relationships": {"hostiles": {}, "allies": {}},
+            "doctrine": {},
         },
         "currentSideId": "",
         "selectedUnitId": "",
@@ -80,6 +81,14 @@ def generate_scenario(num_sides: int, units_per_side: int) -> dict:
         )
         scenario["currentScenario"]["relationships"]["hostiles"][side_id] = []
         scenario["currentScenario"]["relationships"]["allies"][side_id] = []
+        scenario["currentScenario"]["doctrine"][side_id] = {
+            "Aircraft attack hostile aircraft": True,
+            "Aircraft chase hostile aircraft": True,
+            "Aircraft RTB when out of range of homebase": False,
+            "Aircraft RTB when strike mission complete": False,
+            "SAMs attack hostile aircraft": True,
+            "Ships attack hostile aircraft": True,
+        }
 
         for j in range(units_per_side):
             idx = f"{i}-{j}"
@@ -106,6 +115,9 @@ def generate_scenario(num_sides: int, units_per_side: int) -> dict:
                 "selected": False,
                 "sideColor": color,
                 "weapons": [create_weapon(side_id, color, lat, lon)],
+                "homeBaseId": "",
+                "rtb": False,
+                "targetId": "",
             }
             scenario["currentScenario"]["aircraft"].append(aircraft)
 
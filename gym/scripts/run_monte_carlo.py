@@ -0,0 +1,100 @@
+import json
+import time
+import argparse
+
+from blade.Game import TICK_EVENTS
+from blade.utils.MonteCarloRunner import MonteCarloRunner
+
+
+def format_statistic(statistic: dict) -> str:
+    if statistic["count"] == 0:
+        return "n/a"
+    return (
+        f"{statistic['mean']:.2f} +/- {statistic['std']:.2f} "
+        f"[{statistic['min']:g}, {statistic['max']:g}]"
+    )
+
+
+def print_summary(summary: dict) -> None:
+    print(f"replicas: {summary['replicas']} (stopped early: {summary['stopped']})")
+    print(f"scenario seconds: {format_statistic(summary['seconds'])}")
+    for side_id, losses in summary["units_lost"].items():
+        for unit_type, statistic in losses.items():
+            print(f"{side_id} {unit_type} lost: {format_statistic(statistic)}")
+    for side_id, statistic in summary["weapons_expended"].items():
+        print(f"{side_id} weapons expended: {format_statistic(statistic)}")
+    time_to_first_kill = summary["time_to_first_kill"]
+    print(
+        f"time to first kill: {format_statistic(time_to_first_kill)} "
+        f"(kill rate {time_to_first_kill['kill_rate']:.1%})"
+    )
+    for mission_id, rate in summary["mission_completion_rate"].items():
+        print(f"mission {mission_id} completed: {rate:.1%}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Play many seeded replicas of a scenario and summarize outcomes"
+    )
+    parser.add_argument("scenario", help="Scenario JSON file")
+    parser.add_argument(
+        "-n", "--replicas", type=int, default=100, help="Number of replicas to run"
+    )
+    parser.add_argument(
+        "-t", "--ticks", type=int, default=3600, help="Maximum updates per replica"
+    )
+    parser.add_argument(
+        "--max-seconds", type=int, help="Maximum scenario seconds per replica"
+    )
+    parser.add_argument(
+        "--until",
+        choices=TICK_EVENTS,
+        help="Stop a replica after the first tick with this event",
+    )
+    parser.add_argument(
+        "--max-time-step",
+        type=int,
+        default=1,
+        help="Longest adaptive time step in seconds",
+    )
+    parser.add_argument(
+        "--seed", type=int, default=0, help="Root seed of the replica seeds"
+    )
+    parser.add_argument(
+        "-p",
+        "--processes",
+        type=int,
+        help="Number of worker processes, one per core by default",
+    )
+    parser.add_argument(
+        "--chunksize", type=int, default=1, help="Replicas sent to a worker at once"
+    )
+    parser.add_argument(
+        "-o", "--output", help="Write each replica result as a JSON line to this file"
+    )
+    parser.add_argument(
+        "-s", "--summary", help="Write the summary as JSON to this file"
+    )
+    args = parser.parse_args()
+
+    with open(args.scenario, "r", encoding="utf-8") as scenario_file:
+        scenario_string = scenario_file.read()
+
+    runner = MonteCarloRunner(
+        scenario_string,
+        args.ticks,
+        until=args.until,
+        max_seconds=args.max_seconds,
+        max_time_step=args.max_time_step,
+        seed=args.seed,
+    )
+    start = time.perf_counter()
+    summary = runner.run(args.replicas, args.output, args.processes, args.chunksize)
+    elapsed = time.perf_counter() - start
+
+    print_summary(summary)
+    print(f"{args.replicas} replicas in {elapsed:.1f} s")
+
+    if args.summary:
+        with open(args.summary, "w", encoding="utf-8") as summary_file:
+            json.dump(summary, summary_file, indent=2)
@@ -2,6 +2,7 @@ import gymnasium
 import numpy as np
 from blade.Game import Game
 from blade.Scenario import Scenario
+from blade.Action import ActionType
 from stable_baselines3 import PPO
 from gymnasium.spaces import Box
 from blade.utils.utils import get_bearing_between_two_points
@@ -46,8 +47,11 @@ def action_transform_fnc(observation: Scenario, action: np.ndarray):
     if DEBUG:
         print(f"log: {aircraft.black_box.get_last_log_pp()}")
 
-    action = f"move_aircraft('{aircraft.id}', [[{action[0]}, {action[1]}]])"
-    return action
+    return (
+        ActionType.MOVE_AIRCRAFT,
+        aircraft.id,
+        [[float(action[0]), float(action[1])]],
+    )
 
 
 def observation_filter_fnc(observation: Scenario):